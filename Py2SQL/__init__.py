@@ -5,3 +5,7 @@ class objects and class hierarchies in Python from MySQL
 
 from .database_info import DatabaseInfo
 from .py2sql import Py2SQL
+from .async_py2sql import AsyncPy2SQL
+from .result_set import ResultSet
+from .refreshable_result_set import RefreshableResultSet
+from .column_set import ColumnSet
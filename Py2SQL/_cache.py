@@ -0,0 +1,169 @@
+"""
+Has the implementation of TTLCache class
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable
+
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Thread-safe mapping with least recently used eviction and optional time to live of entries
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float or None = None,
+                 on_evict: Callable[[Hashable, Any], None] or None = None) -> None:
+        """
+        Init function
+
+        :param max_size: maximal count of entries, least recently used entry is evicted when it is exceeded
+        :param ttl: time to live of entry in seconds, entries never expire if None
+        :param on_evict: function called with key and value of every removed or replaced entry
+        """
+
+        if type(max_size) != int or max_size < 1:
+            raise ValueError('max_size must be positive int')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be positive or None')
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+
+        self.__entries = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns value by key and marks entry as recently used
+
+        :param key: key of entry
+        :param default: value returned if there is no entry or entry is expired
+        :return: cached value or default
+        """
+
+        expired = None
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and self.ttl is not None and entry[1] <= time.monotonic():
+                expired = self.__entries.pop(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+
+        if expired is not None:
+            self.__evicted([(key, expired)])
+        return default if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Adds or replaces entry and evicts least recently used entries over max_size
+
+        :param key: key of entry
+        :param value: value of entry
+        """
+
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        evicted = list()
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None and previous[0] is not value:
+                evicted.append((key, previous))
+            self.__entries[key] = (value, expires)
+            while len(self.__entries) > self.max_size:
+                evicted.append(self.__entries.popitem(last=False))
+
+        self.__evicted(evicted)
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        """
+        Returns value of existing entry or adds entry with value if there is no entry or entry is expired
+
+        :param key: key of entry
+        :param value: value of new entry
+        :return: value of existing entry or value
+        """
+
+        now = time.monotonic()
+        evicted = list()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and (self.ttl is None or entry[1] > now):
+                self.__entries.move_to_end(key)
+                return entry[0]
+
+            if entry is not None:
+                evicted.append((key, self.__entries.pop(key)))
+            self.__entries[key] = (value, now + self.ttl if self.ttl is not None else None)
+            while len(self.__entries) > self.max_size:
+                evicted.append(self.__entries.popitem(last=False))
+
+        self.__evicted(evicted)
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] or None = None) -> int:
+        """
+        Removes entries which keys match predicate or all entries if predicate is None
+
+        :param predicate: function that takes key and returns True if entry must be removed
+        :return: count of removed entries
+        """
+
+        with self.__lock:
+            if predicate is None:
+                evicted = list(self.__entries.items())
+                self.__entries.clear()
+            else:
+                evicted = [(key, self.__entries.pop(key)) for key in list(self.__entries) if predicate(key)]
+
+        self.__evicted(evicted)
+        return len(evicted)
+
+    def remove(self, keys: Iterable[Hashable]) -> int:
+        """
+        Removes entries by keys, missing keys are ignored
+
+        :param keys: keys of entries
+        :return: count of removed entries
+        """
+
+        with self.__lock:
+            evicted = [(key, self.__entries.pop(key)) for key in keys if key in self.__entries]
+
+        self.__evicted(evicted)
+        return len(evicted)
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Returns cache statistics
+        Format: {'hits': int, 'misses': int, 'size': int, 'max_size': int, 'ttl': float or None}
+
+        :return: dictionary with cache statistics
+        """
+
+        with self.__lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self.__entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl
+            }
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def __evicted(self, entries):
+        if self.on_evict is not None:
+            for key, entry in entries:
+                self.on_evict(key, entry[0])
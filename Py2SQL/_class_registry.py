@@ -0,0 +1,205 @@
+"""
+Has the implementation of ClassRegistry class
+"""
+
+from typing import Any, Dict, Hashable, List, Tuple
+
+import keyword
+import threading
+
+from ._relations import Relation
+
+
+class ClassRegistry:
+    """
+    Thread-safe in-process registry of classes generated from table structures
+    """
+
+    COLUMNS_ATTRIBUTE = '_py2sql_columns'
+    KEY_ATTRIBUTE = '_py2sql_key'
+
+    def __init__(self) -> None:
+        """
+        Init function
+        """
+
+        self.__classes: Dict[Hashable, type] = dict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Hashable, column_names: List[str]) -> type or None:
+        """
+        Returns registered class if it was generated for the same columns
+
+        :param key: key of class, for example (database, table)
+        :param column_names: current column names of table
+        :return: registered class or None
+        """
+
+        generated_class = self.__classes.get(key)
+        if generated_class is None or getattr(generated_class, ClassRegistry.COLUMNS_ATTRIBUTE) != tuple(column_names):
+            return None
+        return generated_class
+
+    def register(self, key: Hashable, class_name: str, column_names: List[str]) -> type:
+        """
+        Generates class with field names from column names and registers it,
+        registered class is returned if it was generated for the same columns
+
+        :param key: key of class, for example (database, table)
+        :param class_name: name of new class
+        :param column_names: names of class fields in order of __init__ arguments
+        :return: generated class
+        """
+
+        with self.__lock:
+            generated_class = self.get(key, column_names)
+            if generated_class is None:
+                generated_class = ClassRegistry.generate(class_name, column_names, key)
+                self.__classes[key] = generated_class
+            return generated_class
+
+    def remove(self, key: Hashable or None = None) -> None:
+        """
+        Removes registered class or all classes if key is None
+
+        :param key: key of class
+        """
+
+        with self.__lock:
+            if key is None:
+                self.__classes.clear()
+            else:
+                self.__classes.pop(key, None)
+
+    @staticmethod
+    def generate(class_name: str, column_names: List[str], key: Hashable = None) -> type:
+        """
+        Generates class with __slots__ and compiled __init__ that takes field values in order of column names,
+        class without __slots__ is generated if some column name isn't valid python identifier
+        Slotted class also has slot for cache of loaded relations
+        Class has classmethods _from_row(row) and _from_rows(rows) that create objects from rows of table
+        without calling __init__ per object
+        Objects are pickled by key, class name, column names and field values and unpickled as objects of class
+        registered in CLASS_REGISTRY by the same key, so generated class doesn't have to be importable
+
+        :param class_name: name of new class
+        :param column_names: names of class fields
+        :param key: key of class in registry, for example (database, table)
+        :return: generated class
+        """
+
+        column_names = tuple(column_names)
+        namespace = {
+            ClassRegistry.COLUMNS_ATTRIBUTE: column_names,
+            ClassRegistry.KEY_ATTRIBUTE: key,
+            '__repr__': ClassRegistry.__repr,
+            '__reduce__': ClassRegistry.__reduce
+        }
+
+        if all(ClassRegistry.__is_field_name(name) for name in column_names):
+            namespace['__slots__'] = column_names + (Relation.RELATED_ATTRIBUTE,)
+            namespace['__init__'] = ClassRegistry.__compile_init(column_names)
+            namespace.update(ClassRegistry.__compile_factories(column_names))
+        else:
+            namespace['__init__'] = ClassRegistry.__generic_init(column_names)
+            namespace['_from_row'] = classmethod(ClassRegistry.__generic_from_row)
+            namespace['_from_rows'] = classmethod(ClassRegistry.__generic_from_rows)
+
+        return type(class_name, (), namespace)
+
+    @staticmethod
+    def source(class_name: str, column_names: List[str]) -> str:
+        """
+        Returns python source of class with field names from column names
+
+        :param class_name: name of class
+        :param column_names: names of class fields
+        :return: source of class
+        """
+
+        lines = [f'class {class_name}:', '\tdef __init__(self' + ''.join(', ' + col for col in column_names) + '):']
+        if len(column_names) == 0:
+            lines.append('\t\tpass')
+        else:
+            lines.extend('\t\tself.' + col + ' = ' + col for col in column_names)
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def __is_field_name(name):
+        return name.isidentifier() and not keyword.iskeyword(name)
+
+    @staticmethod
+    def __compile_init(column_names):
+        arguments = ''.join(', ' + name for name in column_names)
+        body = ''.join(f'\n    _py2sql_self.{name} = {name}' for name in column_names) or '\n    pass'
+        namespace = dict()
+        exec(f'def __init__(_py2sql_self{arguments}):{body}\n', namespace)
+        return namespace['__init__']
+
+    @staticmethod
+    def __compile_factories(column_names):
+        # Row is unpacked directly into slots of object created by object.__new__,
+        # _from_rows unpacks rows in header of loop, so there is no call per row except object.__new__
+        # Local names are prefixed, so they can't clash with column names
+        if len(column_names) == 0:
+            return {
+                '_from_row': classmethod(ClassRegistry.__generic_from_row),
+                '_from_rows': classmethod(ClassRegistry.__generic_from_rows)
+            }
+
+        targets = ''.join(f'_py2sql_self.{name}, ' for name in column_names)
+        names = ''.join(f'{name}, ' for name in column_names)
+        assignments = ''.join(f'\n        _py2sql_self.{name} = {name}' for name in column_names)
+        namespace = dict()
+        exec(f'def _from_row(_py2sql_cls, _py2sql_row, _py2sql_new=object.__new__):\n'
+             f'    _py2sql_self = _py2sql_new(_py2sql_cls)\n'
+             f'    {targets}= _py2sql_row\n'
+             f'    return _py2sql_self\n'
+             f'def _from_rows(_py2sql_cls, _py2sql_rows, _py2sql_new=object.__new__):\n'
+             f'    _py2sql_result = []\n'
+             f'    _py2sql_append = _py2sql_result.append\n'
+             f'    for {names}in _py2sql_rows:\n'
+             f'        _py2sql_self = _py2sql_new(_py2sql_cls){assignments}\n'
+             f'        _py2sql_append(_py2sql_self)\n'
+             f'    return _py2sql_result\n', namespace)
+        return {'_from_row': classmethod(namespace['_from_row']), '_from_rows': classmethod(namespace['_from_rows'])}
+
+    @staticmethod
+    def __generic_from_row(cls, row):
+        return cls(*row)
+
+    @staticmethod
+    def __generic_from_rows(cls, rows):
+        return [cls(*row) for row in rows]
+
+    @staticmethod
+    def __generic_init(column_names):
+        def __init__(self, *values: Any) -> None:
+            if len(values) != len(column_names):
+                raise TypeError(f'__init__() takes {len(column_names)} positional arguments but {len(values)} were given')
+            for name, value in zip(column_names, values):
+                setattr(self, name, value)
+        return __init__
+
+    @staticmethod
+    def __reduce(self):
+        column_names = getattr(self, ClassRegistry.COLUMNS_ATTRIBUTE)
+        return _reconstruct, (getattr(self, ClassRegistry.KEY_ATTRIBUTE), type(self).__name__, column_names,
+                              tuple(getattr(self, name, None) for name in column_names))
+
+    @staticmethod
+    def __repr(self):
+        fields = ', '.join(f'{name}={getattr(self, name, None)!r}'
+                           for name in getattr(self, ClassRegistry.COLUMNS_ATTRIBUTE))
+        return f'{type(self).__name__}({fields})'
+
+
+CLASS_REGISTRY = ClassRegistry()
+
+
+def _reconstruct(key: Hashable, class_name: str, column_names: Tuple[str, ...], values: Tuple[Any, ...]) -> Any:
+    # Unpickles object of generated class, class is registered if this process hasn't generated it yet,
+    # class generated without key is registered by class name
+    if key is None:
+        key = (None, class_name)
+    return CLASS_REGISTRY.register(key, class_name, list(column_names))._from_row(values)
@@ -0,0 +1,232 @@
+"""
+Has the implementation of ConnectionPool class
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import mysql.connector
+import threading
+import time
+
+from .database_info import DatabaseInfo
+
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections with health check of idle connections
+    Connections are opened in autocommit mode, so every read sees the latest committed data
+    instead of snapshot of transaction left open by previous call, writes must start transaction explicitly
+    """
+
+    __thread_state = threading.local()
+
+    def __init__(self, db: DatabaseInfo, size: int = 1, timeout: float or None = 30.0,
+                 stale_after: float = 60.0) -> None:
+        """
+        Init function, opens the first connection
+
+        :param db: parameters to connect to database
+        :param size: maximal count of opened connections
+        :param timeout: time in seconds to wait for free connection, wait forever if None
+        :param stale_after: time in seconds after which idle connection is pinged before use
+        """
+
+        if type(size) != int or size < 1:
+            raise ValueError('pool_size must be positive int')
+
+        self.db = db
+        self.size = size
+        self.timeout = timeout
+        self.stale_after = stale_after
+
+        self.__idle: List[Any] = []
+        self.__owners: Dict[int, int] = dict()
+        self.__opened = 0
+        self.__closed = False
+        self.__condition = threading.Condition()
+        self.__local = threading.local()
+
+        self.checkin(self.__open())
+
+    def checkout(self) -> Any:
+        """
+        Takes connection from pool, opens new one if there is no idle connection and pool isn't full,
+        otherwise waits for connection to be returned
+        RuntimeError is raised instead of waiting if all connections are held by the calling thread,
+        which isn't shared (see share_thread)
+
+        :return: connection to database
+        """
+
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        owner = ConnectionPool.__owner()
+        with self.__condition:
+            while True:
+                if self.__closed:
+                    raise ValueError('Database isn\'t connected')
+                if self.__idle:
+                    connection, last_used = self.__idle.pop()
+                    break
+                if self.__opened < self.size:
+                    self.__opened += 1
+                    connection, last_used = None, None
+                    break
+                if owner is not None and list(self.__owners.values()).count(owner) >= self.size:
+                    # Connections can be returned only by this thread, for example by closing generator
+                    # of iter_objects_by, so waiting for them would always end with timeout
+                    raise RuntimeError('All connections of pool are held by this thread, '
+                                       'for example by unfinished iter_objects_by or iter_class generators, '
+                                       'use larger pool_size of db_connect')
+
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError('No free database connection in pool')
+                self.__condition.wait(remaining)
+
+        try:
+            if connection is None:
+                connection = self.__connect()
+            else:
+                connection = self.__check_health(connection, last_used)
+        except BaseException:
+            self.__release_slot()
+            raise
+
+        with self.__condition:
+            self.__owners[id(connection)] = owner
+        return connection
+
+    def claim(self, connection: Any) -> None:
+        """
+        Marks connection as held by the calling thread, generators that hold connection call it every time
+        they are advanced, because they can be advanced by different threads
+
+        :param connection: connection taken by checkout
+        """
+
+        with self.__condition:
+            if id(connection) in self.__owners:
+                self.__owners[id(connection)] = ConnectionPool.__owner()
+
+    @staticmethod
+    def share_thread() -> None:
+        """
+        Marks the calling thread as shared, connections held by shared threads aren't attributed to them,
+        for example threads of executor that advance generators of different callers
+        """
+
+        ConnectionPool.__thread_state.shared = True
+
+    def checkin(self, connection: Any, discard: bool = False) -> None:
+        """
+        Returns connection to pool
+
+        :param connection: connection taken by checkout
+        :param discard: close connection instead of reuse, for example after connection error
+        """
+
+        with self.__condition:
+            self.__owners.pop(id(connection), None)
+            if not discard and not self.__closed:
+                self.__idle.append((connection, time.monotonic()))
+                self.__condition.notify()
+                return
+
+        self.__close_connection(connection)
+        self.__release_slot()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Context manager that borrows connection for the duration of block,
+        nested blocks in the same thread use the same connection
+
+        :return: connection to database
+        """
+
+        held = getattr(self.__local, 'held', None)
+        if held is not None:
+            self.__local.depth += 1
+            try:
+                yield held
+            finally:
+                self.__local.depth -= 1
+            return
+
+        connection = self.checkout()
+        self.__local.held = connection
+        self.__local.depth = 0
+        discard = False
+        try:
+            yield connection
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            discard = True
+            raise
+        finally:
+            self.__local.held = None
+            self.checkin(connection, discard)
+
+    def close(self) -> None:
+        """
+        Closes idle connections, connections in use are closed when they are returned
+        """
+
+        with self.__condition:
+            self.__closed = True
+            idle = self.__idle
+            self.__idle = []
+            self.__opened -= len(idle)
+            self.__condition.notify_all()
+
+        for connection, _ in idle:
+            self.__close_connection(connection)
+
+    def __open(self) -> Any:
+        with self.__condition:
+            self.__opened += 1
+        try:
+            return self.__connect()
+        except BaseException:
+            self.__release_slot()
+            raise
+
+    def __connect(self) -> Any:
+        return mysql.connector.connect(
+            host=self.db.host,
+            user=self.db.user,
+            password=self.db.password,
+            database=self.db.database,
+            autocommit=True
+        )
+
+    def __check_health(self, connection, last_used):
+        if time.monotonic() - last_used < self.stale_after:
+            return connection
+
+        # Broken connection is replaced by new object instead of reconnecting in place,
+        # because state bound to connection object, such as prepared statements, belongs to the old session
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except mysql.connector.Error:
+            self.__close_connection(connection)
+            return self.__connect()
+
+    @staticmethod
+    def __owner():
+        if getattr(ConnectionPool.__thread_state, 'shared', False):
+            return None
+        return threading.get_ident()
+
+    def __release_slot(self):
+        with self.__condition:
+            self.__opened -= 1
+            self.__condition.notify()
+
+    @staticmethod
+    def __close_connection(connection):
+        try:
+            connection.close()
+        except mysql.connector.Error:
+            pass
@@ -0,0 +1,242 @@
+"""
+Has the implementation of Instrumentation class and instrumented decorator
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+import functools
+import inspect
+import logging
+import threading
+import time
+
+
+class Instrumentation:
+    """
+    Collects per method statistics of Py2SQL calls: count of calls, SQL round trips, time spent in database,
+    fetched rows, time spent to build python objects and schema cache hits
+    Queries are attributed to the outermost public method of the current thread
+    """
+
+    COUNTERS = ('calls', 'seconds', 'round_trips', 'server_seconds', 'rows_fetched',
+                'build_seconds', 'cache_hits', 'cache_misses')
+
+    def __init__(self) -> None:
+        """
+        Init function
+        """
+
+        self.enabled = True
+        self.slow_query_threshold = None
+        self.logger = logging.getLogger('Py2SQL')
+
+        self.__stats: Dict[str, Dict[str, float]] = dict()
+        self.__pre_hooks: List[Callable] = list()
+        self.__post_hooks: List[Callable] = list()
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+
+    def current_method(self) -> str or None:
+        """
+        Returns name of the outermost instrumented method executed by current thread
+
+        :return: method name or None
+        """
+
+        return getattr(self.__local, 'method', None)
+
+    @contextmanager
+    def context(self, method: str, count_call: bool = False, timed: bool = False) -> Iterator[None]:
+        """
+        Context manager that attributes queries of current thread to method if no other method is active
+
+        :param method: method name
+        :param count_call: count call and its duration in method statistics
+        :param timed: add duration of block to method statistics without counting call,
+        for example for every step of generator
+        """
+
+        if not self.enabled or self.current_method() is not None:
+            yield
+            return
+
+        self.__local.method = method
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__local.method = None
+            if count_call:
+                self.__add(method, calls=1, seconds=time.perf_counter() - start)
+            elif timed:
+                self.__add(method, seconds=time.perf_counter() - start)
+
+    def before_query(self, query: str, parameters: Sequence[Any] or None) -> float:
+        """
+        Calls pre-query hooks, must be called right before query execution
+
+        :param query: SQL statement
+        :param parameters: statement parameters
+        :return: start time to pass to after_query
+        """
+
+        if self.enabled:
+            method = self.current_method()
+            for hook in self.__pre_hooks:
+                hook(method, query, parameters)
+        return time.perf_counter()
+
+    def after_query(self, query: str, parameters: Sequence[Any] or None, start: float, rows: int) -> None:
+        """
+        Records round trip, calls post-query hooks and logs slow query
+
+        :param query: SQL statement
+        :param parameters: statement parameters
+        :param start: value returned by before_query
+        :param rows: count of fetched rows
+        """
+
+        if not self.enabled:
+            return
+
+        seconds = time.perf_counter() - start
+        method = self.current_method()
+        self.__add(method, round_trips=1, server_seconds=seconds, rows_fetched=rows)
+
+        for hook in self.__post_hooks:
+            hook(method, query, parameters, seconds, rows)
+
+        if self.slow_query_threshold is not None and seconds >= self.slow_query_threshold:
+            self.logger.warning('Slow query in %s (%.3f s): %s', method, seconds, query)
+
+    def add_rows(self, rows: int, seconds: float) -> None:
+        """
+        Adds rows fetched after query execution, for example by streaming cursor
+
+        :param rows: count of fetched rows
+        :param seconds: time spent to fetch rows
+        """
+
+        if self.enabled:
+            self.__add(self.current_method(), server_seconds=seconds, rows_fetched=rows)
+
+    @contextmanager
+    def building(self) -> Iterator[None]:
+        """
+        Context manager that adds duration of block to time spent to build python objects
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__add(self.current_method(), build_seconds=time.perf_counter() - start)
+
+    def record_cache(self, hit: bool) -> None:
+        """
+        Records schema cache access
+
+        :param hit: True if cached value was found
+        """
+
+        if self.enabled:
+            self.__add(self.current_method(), **{'cache_hits' if hit else 'cache_misses': 1})
+
+    def add_hook(self, pre: Callable or None = None, post: Callable or None = None) -> None:
+        """
+        Adds query hooks
+
+        :param pre: function (method, query, parameters) called before every query
+        :param post: function (method, query, parameters, seconds, rows) called after every query
+        """
+
+        with self.__lock:
+            if pre is not None:
+                self.__pre_hooks = self.__pre_hooks + [pre]
+            if post is not None:
+                self.__post_hooks = self.__post_hooks + [post]
+
+    def remove_hook(self, hook: Callable) -> None:
+        """
+        Removes pre-query or post-query hook
+
+        :param hook: previously added function
+        """
+
+        with self.__lock:
+            self.__pre_hooks = [x for x in self.__pre_hooks if x is not hook]
+            self.__post_hooks = [x for x in self.__post_hooks if x is not hook]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns copy of statistics
+
+        :return: dictionary where key is method name and value is dictionary of counters
+        """
+
+        with self.__lock:
+            return {method: dict(counters) for method, counters in self.__stats.items()}
+
+    def reset(self) -> None:
+        """
+        Clears statistics
+        """
+
+        with self.__lock:
+            self.__stats = dict()
+
+    def __add(self, method, **values):
+        method = method if method is not None else '<unknown>'
+        with self.__lock:
+            counters = self.__stats.get(method)
+            if counters is None:
+                counters = dict.fromkeys(Instrumentation.COUNTERS, 0)
+                self.__stats[method] = counters
+            for key, value in values.items():
+                counters[key] += value
+
+
+INSTRUMENTATION = Instrumentation()
+
+
+def instrumented(function: Callable) -> Callable:
+    """
+    Decorator that attributes queries of function to its name and counts its calls,
+    generator functions are attributed while they are advanced and time of every step is added to their duration
+
+    :param function: public method
+    :return: wrapped method
+    """
+
+    name = function.__name__
+
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            with INSTRUMENTATION.context(name, count_call=True):
+                generator = function(*args, **kwargs)
+            finished = object()
+            try:
+                while True:
+                    with INSTRUMENTATION.context(name, timed=True):
+                        item = next(generator, finished)
+                    if item is finished:
+                        return
+                    yield item
+            finally:
+                with INSTRUMENTATION.context(name, timed=True):
+                    generator.close()
+
+        return generator_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with INSTRUMENTATION.context(name, count_call=True):
+            return function(*args, **kwargs)
+
+    return wrapper
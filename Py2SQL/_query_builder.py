@@ -0,0 +1,112 @@
+"""
+Has the implementation of QueryBuilder class
+"""
+
+from typing import Any, List, Sequence, Tuple
+
+from ._init_locker import InitLocker
+
+
+class QueryBuilder(metaclass=InitLocker):
+    """
+    Builds SQL statements with quoted identifiers and %s placeholders for all values,
+    so statements of the same shape have the same text and can be reused as prepared statements
+    """
+
+    OPERATORS = ('=', '<', '<=', '>', '>=', 'IN')
+
+    @staticmethod
+    def quote(identifier: str) -> str:
+        """
+        Returns identifier quoted with backticks
+
+        :param identifier: name of table or column
+        :return: quoted identifier
+        """
+
+        if type(identifier) != str:
+            raise TypeError('identifier must be str')
+        return '`' + identifier.replace('`', '``') + '`'
+
+    @staticmethod
+    def select(table: str, conditions: Sequence[Tuple[str, str, Any]] = (), order_by: str or None = None,
+               limit: int or None = None, columns: Sequence[str] or None = None) -> Tuple[str, Tuple[Any, ...]]:
+        """
+        Builds SELECT statement
+
+        :param table: table name
+        :param conditions: tuples (column, operator, value) joined with AND,
+        where operator is one of =, <, <=, >, >=, IN and value of IN is sequence of values
+        :param order_by: name of column to order by or None
+        :param limit: maximal count of rows or None
+        :param columns: names of selected columns or None to select all columns
+        :return: tuple (statement, parameters)
+        """
+
+        selected = '*' if columns is None else ', '.join(QueryBuilder.quote(column) for column in columns)
+        statement = f'SELECT {selected} FROM {QueryBuilder.quote(table)}'
+
+        where_part, parameters = QueryBuilder.where(conditions)
+        statement += where_part
+
+        if order_by is not None:
+            statement += f' ORDER BY {QueryBuilder.quote(order_by)}'
+        if limit is not None:
+            statement += ' LIMIT %s'
+            parameters.append(limit)
+
+        return statement + ';', tuple(parameters)
+
+    @staticmethod
+    def insert(table: str, columns: Sequence[str], update_columns: Sequence[str] or None = None) -> str:
+        """
+        Builds INSERT statement for one row, mysql.connector executemany sends it as multi-row INSERT
+
+        :param table: table name
+        :param columns: names of inserted columns
+        :param update_columns: names of columns updated by ON DUPLICATE KEY UPDATE or None for plain INSERT
+        :return: statement
+        """
+
+        if len(columns) == 0:
+            raise ValueError('INSERT requires at least one column')
+
+        statement = 'INSERT INTO {0} ({1}) VALUES ({2})'.format(
+            QueryBuilder.quote(table),
+            ', '.join(QueryBuilder.quote(column) for column in columns),
+            ', '.join(['%s'] * len(columns))
+        )
+        if update_columns is not None and len(update_columns) > 0:
+            statement += ' ON DUPLICATE KEY UPDATE ' + ', '.join(
+                '{0} = VALUES({0})'.format(QueryBuilder.quote(column)) for column in update_columns)
+
+        return statement + ';'
+
+    @staticmethod
+    def where(conditions: Sequence[Tuple[str, str, Any]]) -> Tuple[str, List[Any]]:
+        """
+        Builds WHERE part of statement
+
+        :param conditions: tuples (column, operator, value) joined with AND
+        :return: tuple (where part with leading space or empty string, list of parameters)
+        """
+
+        parts = list()
+        parameters = list()
+        for column, operator, value in conditions:
+            if operator not in QueryBuilder.OPERATORS:
+                raise ValueError(f'Unsupported operator {operator}')
+
+            if operator == 'IN':
+                values = list(value)
+                if len(values) == 0:
+                    raise ValueError('IN condition requires at least one value')
+                parts.append('{0} IN ({1})'.format(QueryBuilder.quote(column), ', '.join(['%s'] * len(values))))
+                parameters.extend(values)
+            else:
+                parts.append(f'{QueryBuilder.quote(column)} {operator} %s')
+                parameters.append(value)
+
+        if len(parts) == 0:
+            return '', parameters
+        return ' WHERE ' + ' AND '.join(parts), parameters
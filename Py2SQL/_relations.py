@@ -0,0 +1,115 @@
+"""
+Has the implementation of Relation class
+"""
+
+from typing import Any, Callable, List
+
+
+class Relation:
+    """
+    Descriptor of relationship attribute of generated class built from foreign key
+    Forward relation (many is False) returns referenced object or None, for example order.customer,
+    reverse relation (many is True) returns list of referencing objects, for example customer.orders
+    Value is loaded on first access by loader and cached in RELATED_ATTRIBUTE of object
+    """
+
+    RELATED_ATTRIBUTE = '_py2sql_related'
+    RELATIONS_ATTRIBUTE = '_py2sql_relations'
+
+    def __init__(self, name: str, column: str, target_table: str, target_column: str, many: bool,
+                 loader: Callable[['Relation', List[Any]], None]) -> None:
+        """
+        Init function
+
+        :param name: name of attribute
+        :param column: column of object which value is looked up
+        :param target_table: table of related objects
+        :param target_column: column of related objects which must be equal to value of column
+        :param many: relation returns list of objects instead of one object
+        :param loader: function that takes relation and list of objects and sets values of relation for all objects
+        """
+
+        self.name = name
+        self.column = column
+        self.target_table = target_table
+        self.target_column = target_column
+        self.many = many
+        self.loader = loader
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+
+        related = Relation.related(instance)
+        if self.name not in related:
+            self.loader(self, [instance])
+        return related[self.name]
+
+    def is_loaded(self, instance: Any) -> bool:
+        """
+        Checks if value of relation is already loaded for object
+
+        :param instance: object of generated class
+        :return: True if value is cached
+        """
+
+        related = getattr(instance, Relation.RELATED_ATTRIBUTE, None)
+        return related is not None and self.name in related
+
+    def set(self, instance: Any, value: Any) -> None:
+        """
+        Caches loaded value of relation for object
+
+        :param instance: object of generated class
+        :param value: related object, None or list of related objects
+        """
+
+        Relation.related(instance)[self.name] = value
+
+    def __repr__(self) -> str:
+        return (f'Relation({self.name!r}, {self.column!r} -> {self.target_table}.{self.target_column}, '
+                f'many={self.many})')
+
+    @staticmethod
+    def related(instance: Any) -> dict:
+        """
+        Returns cache of loaded relations of object, cache is created on first call
+
+        :param instance: object of generated class
+        :return: dictionary where key is relation name and value is loaded value
+        """
+
+        related = getattr(instance, Relation.RELATED_ATTRIBUTE, None)
+        if related is None:
+            related = dict()
+            setattr(instance, Relation.RELATED_ATTRIBUTE, related)
+        return related
+
+    @staticmethod
+    def clear(instance: Any) -> None:
+        """
+        Removes loaded relations of object, they are loaded again on next access
+
+        :param instance: object of generated class
+        """
+
+        if getattr(instance, Relation.RELATED_ATTRIBUTE, None) is not None:
+            setattr(instance, Relation.RELATED_ATTRIBUTE, None)
+
+    @staticmethod
+    def singular(name: str) -> str:
+        """
+        Returns singular form of plural english table name, for example customers -> customer
+
+        :param name: table name
+        :return: singular name or the same name if it doesn't look plural
+        """
+
+        lower_name = name.lower()
+        if lower_name.endswith('ies') and len(name) > 3:
+            return name[:-3] + 'y'
+        if lower_name.endswith(('sses', 'xes', 'ches', 'shes', 'zes')):
+            return name[:-2]
+        if lower_name.endswith('s') and not lower_name.endswith(('ss', 'us', 'is')) and len(name) > 1:
+            return name[:-1]
+        return name
@@ -0,0 +1,74 @@
+"""
+Has the implementation of scan_chunk function executed in worker processes of Py2SQL.scan_table
+"""
+
+from typing import Any, List, Sequence, Tuple
+
+import mysql.connector
+import time
+
+from .database_info import DatabaseInfo
+
+# Connection of worker process, it is reused by all chunks read by the process and closed when the process exits
+_connection = None
+_connection_parameters = None
+
+
+def scan_chunk(db: DatabaseInfo, query: str, parameters: Sequence[Any], columns: Sequence[Tuple[str, str]],
+               key_index: int or None) -> Tuple[List[List[Tuple[str, str, Any]]], Any, float]:
+    """
+    Executes query on connection of worker process and builds table rows from its result
+    Function is defined on module level, so it can be pickled and executed in worker process of ProcessPoolExecutor
+
+    :param db: parameters to connect to database
+    :param query: SELECT statement
+    :param parameters: statement parameters
+    :param columns: list of tuples (attribute, type) in order of selected columns
+    :param key_index: index of key column which value of the last row is returned or None
+    :return: tuple (rows, last_key, seconds), where rows are lists of tuples (attribute, type, value),
+    last_key is value of key column of the last row or None and seconds is time spent to execute query and fetch rows
+    """
+
+    # Connection isn't pinged before every chunk, it is opened again only if query fails because it was lost
+    start = time.perf_counter()
+    try:
+        data = _execute(_connect(db), query, parameters)
+    except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+        _disconnect()
+        start = time.perf_counter()
+        data = _execute(_connect(db), query, parameters)
+    seconds = time.perf_counter() - start
+
+    rows = [[(name, column_type, value) for (name, column_type), value in zip(columns, item)] for item in data]
+    last_key = data[-1][key_index] if key_index is not None and len(data) > 0 else None
+    return rows, last_key, seconds
+
+
+def _execute(connection, query, parameters):
+    cursor = connection.cursor()
+    cursor.execute(query, parameters)
+    return cursor.fetchall()
+
+
+def _connect(db):
+    global _connection, _connection_parameters
+
+    connection_parameters = (db.host, db.user, db.password, db.database)
+    if _connection is None or _connection_parameters != connection_parameters:
+        _disconnect()
+        _connection = mysql.connector.connect(host=db.host, user=db.user, password=db.password,
+                                              database=db.database, autocommit=True)
+        _connection_parameters = connection_parameters
+    return _connection
+
+
+def _disconnect():
+    global _connection, _connection_parameters
+
+    if _connection is not None:
+        try:
+            _connection.close()
+        except mysql.connector.Error:
+            pass
+    _connection = None
+    _connection_parameters = None
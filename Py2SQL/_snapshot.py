@@ -0,0 +1,172 @@
+"""
+Has the implementation of Snapshot class
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+
+
+class Snapshot:
+    """
+    Read-only snapshot of table structures and rows stored in binary file
+    File is memory-mapped and rows of table are unpickled only when they are used for the first time
+    File format: magic, length of header, JSON header with database name and table descriptions
+    (structure, version, offset and length of rows), pickled lists of rows of every table
+    Snapshot files are unpickled, so only trusted files must be loaded
+    """
+
+    MAGIC = b'PY2SQLS1'
+    HEADER_LENGTH = struct.Struct('<I')
+
+    def __init__(self, path: str) -> None:
+        """
+        Init function, maps file to memory and reads its header
+
+        :param path: path of snapshot file
+        """
+
+        self.path = path
+
+        with open(path, 'rb') as file:
+            self.__mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            data_start = len(Snapshot.MAGIC) + Snapshot.HEADER_LENGTH.size
+            if self.__mmap[:len(Snapshot.MAGIC)] != Snapshot.MAGIC:
+                raise ValueError(f'{path} isn\'t Py2SQL snapshot')
+            header_length = Snapshot.HEADER_LENGTH.unpack_from(self.__mmap, len(Snapshot.MAGIC))[0]
+            header = json.loads(self.__mmap[data_start: data_start + header_length].decode('utf-8'))
+        except BaseException:
+            self.__mmap.close()
+            raise
+
+        self.__data_start = data_start + header_length
+        self.database: str = header['database']
+        self.__tables: Dict[str, Dict[str, Any]] = header['tables']
+        self.__rows: Dict[str, List[Tuple[Any, ...]]] = dict()
+        self.__rows_by_id: Dict[str, Dict[Any, Tuple[Any, ...]]] = dict()
+        self.__lock = threading.Lock()
+
+    @property
+    def tables(self) -> List[str]:
+        """
+        Returns names of tables stored in snapshot
+
+        :return: list of table names
+        """
+
+        return list(self.__tables.keys())
+
+    def structure(self, table: str) -> List[Tuple[int, str, str]]:
+        """
+        Returns structure of table in format of Py2SQL.db_table_structure
+
+        :param table: table name
+        :return: list of tuples (id, name, type)
+        """
+
+        return [tuple(column) for column in self.__tables[table]['structure']]
+
+    def version(self, table: str) -> List[Any] or None:
+        """
+        Returns version of table at the moment of snapshot
+
+        :param table: table name
+        :return: list [update_time, checksum], where update_time is string or None and checksum is int or None,
+        or None if version was unknown
+        """
+
+        version = self.__tables[table]['version']
+        return list(version) if version is not None else None
+
+    def rows(self, table: str) -> List[Tuple[Any, ...]]:
+        """
+        Returns rows of table, rows are unpickled on first call
+
+        :param table: table name
+        :return: list of tuples of values in order of columns
+        """
+
+        rows = self.__rows.get(table)
+        if rows is None:
+            description = self.__tables[table]
+            with self.__lock:
+                rows = self.__rows.get(table)
+                if rows is None:
+                    start = self.__data_start + description['offset']
+                    with memoryview(self.__mmap)[start: start + description['length']] as data:
+                        rows = pickle.loads(data)
+                    self.__rows[table] = rows
+        return rows
+
+    def row_by_id(self, table: str, id: Any) -> Tuple[Any, ...] or None:
+        """
+        Returns row of table by value of id column, index of rows by id is built on first call
+
+        :param table: table name
+        :param id: id of row
+        :return: row or None if there is no row with id
+        """
+
+        rows_by_id = self.__rows_by_id.get(table)
+        if rows_by_id is None:
+            id_index = [column[1] for column in self.structure(table)].index('id')
+            rows_by_id = {row[id_index]: row for row in self.rows(table)}
+            self.__rows_by_id[table] = rows_by_id
+        return rows_by_id.get(id)
+
+    def close(self) -> None:
+        """
+        Unmaps file, rows which were already unpickled stay available
+        Snapshot must not be read by other threads, otherwise file is unmapped when snapshot is garbage collected
+        """
+
+        self.__mmap.close()
+
+    @staticmethod
+    def write(path: str, database: str,
+              tables: Sequence[Tuple[str, List[Tuple[int, str, str]], List[Any] or None,
+                                     List[Tuple[Any, ...]]]]) -> None:
+        """
+        Writes snapshot file, file is replaced atomically
+
+        :param path: path of snapshot file
+        :param database: database name
+        :param tables: tuples (table, structure, version, rows), version None is unknown and never matches
+        """
+
+        descriptions = dict()
+        blocks = list()
+        offset = 0
+        for table, structure, version, rows in tables:
+            block = pickle.dumps([tuple(row) for row in rows], protocol=pickle.HIGHEST_PROTOCOL)
+            descriptions[table] = {
+                'structure': [list(column) for column in structure],
+                'version': list(version) if version is not None else None,
+                'offset': offset,
+                'length': len(block)
+            }
+            blocks.append(block)
+            offset += len(block)
+
+        header = json.dumps({'database': database, 'tables': descriptions}).encode('utf-8')
+
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(temporary_path, 'wb') as file:
+                file.write(Snapshot.MAGIC)
+                file.write(Snapshot.HEADER_LENGTH.pack(len(header)))
+                file.write(header)
+                for block in blocks:
+                    file.write(block)
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
@@ -0,0 +1,307 @@
+"""
+Has the implementation of AsyncPy2SQL class
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
+
+import asyncio
+import functools
+import itertools
+
+from .column_set import ColumnSet
+from ._connection_pool import ConnectionPool
+from .database_info import DatabaseInfo
+from ._init_locker import InitLocker
+from .py2sql import Py2SQL, SaveReport
+from .refreshable_result_set import RefreshableResultSet
+from .result_set import ResultSet
+
+
+class AsyncPy2SQL(metaclass=InitLocker):
+    """
+    Awaitable counterpart of Py2SQL
+    Calls of Py2SQL methods are executed in bounded thread pool with one thread per pooled connection,
+    so coroutines can fan out queries with asyncio.gather without blocking event loop
+    Results have exactly the same format as results of Py2SQL methods
+    """
+
+    __executor = None
+
+    @staticmethod
+    async def db_connect(db: DatabaseInfo, pool_size: int = 1) -> None:
+        """
+        Establishes a connection to database, see Py2SQL.db_connect
+
+        :param db: parameters to connect to database
+        :param pool_size: maximal count of opened connections and of concurrently executed calls
+        """
+
+        if type(pool_size) != int or pool_size < 1:
+            raise ValueError('pool_size must be positive int')
+
+        # Generators are advanced by any thread of executor, so connections aren't attributed to its threads
+        executor = ThreadPoolExecutor(max_workers=pool_size, initializer=ConnectionPool.share_thread)
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, Py2SQL.db_connect, db, pool_size)
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+
+        previous_executor = AsyncPy2SQL.__executor
+        AsyncPy2SQL.__executor = executor
+        if previous_executor is not None:
+            previous_executor.shutdown(wait=False)
+
+    @staticmethod
+    async def db_disconnect() -> None:
+        """
+        Terminates the connection to database, see Py2SQL.db_disconnect
+        """
+
+        await AsyncPy2SQL.__run(Py2SQL.db_disconnect)
+        AsyncPy2SQL.__executor.shutdown(wait=False)
+        AsyncPy2SQL.__executor = None
+
+    @staticmethod
+    async def db_engine() -> str:
+        """
+        Awaitable version of Py2SQL.db_engine
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.db_engine)
+
+    @staticmethod
+    async def db_name() -> str:
+        """
+        Awaitable version of Py2SQL.db_name
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.db_name)
+
+    @staticmethod
+    async def db_size() -> float:
+        """
+        Awaitable version of Py2SQL.db_size
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.db_size)
+
+    @staticmethod
+    async def db_tables() -> List[str]:
+        """
+        Awaitable version of Py2SQL.db_tables
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.db_tables)
+
+    @staticmethod
+    async def db_table_structure(table: str) -> List[Tuple[int, str, str]]:
+        """
+        Awaitable version of Py2SQL.db_table_structure
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.db_table_structure, table)
+
+    @staticmethod
+    async def db_table_size(table: str) -> float:
+        """
+        Awaitable version of Py2SQL.db_table_size
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.db_table_size, table)
+
+    @staticmethod
+    async def load_schema() -> None:
+        """
+        Awaitable version of Py2SQL.load_schema
+        """
+
+        await AsyncPy2SQL.__run(Py2SQL.load_schema)
+
+    @staticmethod
+    async def find_object(table: str, py_object: Any,
+                          compact: bool = False) -> List[Tuple[str, str, str]] or ResultSet:
+        """
+        Awaitable version of Py2SQL.find_object
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.find_object, table, py_object, compact)
+
+    @staticmethod
+    async def find_objects_by(table: str, *attributes: Tuple[str, Any],
+                              compact: bool = False) -> List[List[Tuple[str, str, str]]] or ResultSet:
+        """
+        Awaitable version of Py2SQL.find_objects_by
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.find_objects_by, table, *attributes, compact=compact)
+
+    @staticmethod
+    async def find_refreshable(table: str, *attributes: Tuple[str, Any], timestamp: str or None = None,
+                               checksum: bool = False, append_only: bool = False) -> RefreshableResultSet:
+        """
+        Awaitable version of Py2SQL.find_refreshable
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.find_refreshable, table, *attributes, timestamp=timestamp,
+                                       checksum=checksum, append_only=append_only)
+
+    @staticmethod
+    async def refresh(result: RefreshableResultSet, full: bool = False) -> int:
+        """
+        Awaitable version of Py2SQL.refresh
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.refresh, result, full)
+
+    @staticmethod
+    def iter_objects_by(table: str, *attributes: Tuple[str, Any],
+                        batch_size: int = 1000) -> AsyncIterator[List[Tuple[str, str, str]]]:
+        """
+        Asynchronous generator version of Py2SQL.iter_objects_by
+        """
+
+        return AsyncPy2SQL.__iterate(Py2SQL.iter_objects_by(table, *attributes, batch_size=batch_size))
+
+    @staticmethod
+    async def fetch_columns(table: str, *attributes: Tuple[str, Any], columns: List[str] or None = None,
+                            batch_size: int = 1000, use_numpy: bool or None = None) -> ColumnSet:
+        """
+        Awaitable version of Py2SQL.fetch_columns
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.fetch_columns, table, *attributes, columns=columns,
+                                       batch_size=batch_size, use_numpy=use_numpy)
+
+    @staticmethod
+    async def find_class(py_class: Any, compact: bool = False) -> List[List[Tuple[str, str, str]]] or ResultSet:
+        """
+        Awaitable version of Py2SQL.find_class
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.find_class, py_class, compact)
+
+    @staticmethod
+    def iter_class(py_class: Any, batch_size: int = 1000) -> AsyncIterator[List[Tuple[str, str, str]]]:
+        """
+        Asynchronous generator version of Py2SQL.iter_class
+        """
+
+        return AsyncPy2SQL.__iterate(Py2SQL.iter_class(py_class, batch_size))
+
+    @staticmethod
+    def scan_table(table: str, partitions: int = 4, ordered: bool = True, processes: int or None = None,
+                   batch_size: int = 1000) -> AsyncIterator[List[Tuple[str, str, str]]]:
+        """
+        Asynchronous generator version of Py2SQL.scan_table
+        """
+
+        return AsyncPy2SQL.__iterate(Py2SQL.scan_table(table, partitions, ordered, processes, batch_size))
+
+    @staticmethod
+    async def find_classes_by(*attributes: Tuple[str, ...]) -> List[List[Tuple[str, str]]]:
+        """
+        Awaitable version of Py2SQL.find_classes_by
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.find_classes_by, *attributes)
+
+    @staticmethod
+    async def create_object(table: str, id: int) -> Any or None:
+        """
+        Awaitable version of Py2SQL.create_object
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.create_object, table, id)
+
+    @staticmethod
+    async def create_objects(table: str, fid: int, lid: int) -> List[Any]:
+        """
+        Awaitable version of Py2SQL.create_objects
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.create_objects, table, fid, lid)
+
+    @staticmethod
+    def iter_objects(table: str, fid: int, lid: int, page_size: int = 1000,
+                     prefetch: bool = False) -> AsyncIterator[Any]:
+        """
+        Asynchronous generator version of Py2SQL.iter_objects
+        """
+
+        return AsyncPy2SQL.__iterate(Py2SQL.iter_objects(table, fid, lid, page_size, prefetch))
+
+    @staticmethod
+    async def create_objects_by_ids(table: str, ids: List[Any],
+                                    batch_size: int = 1000) -> Tuple[List[Any], List[Any]]:
+        """
+        Awaitable version of Py2SQL.create_objects_by_ids
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.create_objects_by_ids, table, ids, batch_size)
+
+    @staticmethod
+    async def save_objects(table: str, objects: Iterator[Any], batch_size: int = 1000, upsert: bool = False,
+                           single_transaction: bool = False) -> SaveReport:
+        """
+        Awaitable version of Py2SQL.save_objects
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.save_objects, table, objects, batch_size, upsert, single_transaction)
+
+    @staticmethod
+    async def create_class(table: str, module: str or None = None) -> type:
+        """
+        Awaitable version of Py2SQL.create_class
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.create_class, table, module)
+
+    @staticmethod
+    async def create_hierarchy(table: str, package: str or None = None, workers: int = 1) -> Dict[str, type]:
+        """
+        Awaitable version of Py2SQL.create_hierarchy
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.create_hierarchy, table, package, workers)
+
+    @staticmethod
+    async def load_hierarchy(table: str, workers: int = 1) -> Dict[str, List[Any]]:
+        """
+        Awaitable version of Py2SQL.load_hierarchy
+        """
+
+        return await AsyncPy2SQL.__run(Py2SQL.load_hierarchy, table, workers)
+
+    @staticmethod
+    async def prefetch(objects: List[Any], *relations: str) -> None:
+        """
+        Awaitable version of Py2SQL.prefetch
+        """
+
+        await AsyncPy2SQL.__run(Py2SQL.prefetch, objects, *relations)
+
+    @staticmethod
+    async def __run(function, *args, **kwargs):
+        if AsyncPy2SQL.__executor is None:
+            raise ValueError('Database isn\'t connected')
+
+        return await asyncio.get_running_loop().run_in_executor(AsyncPy2SQL.__executor,
+                                                              functools.partial(function, *args, **kwargs))
+
+    @staticmethod
+    async def __iterate(generator, chunk_size=1000):
+        # Synchronous generator is advanced in thread pool by chunks of items
+        # Returned asynchronous generator is iterated by caller directly, so break or aclose closes it
+        # and closing synchronous generator returns borrowed connection to pool; it is closed in default executor,
+        # because all threads of bounded pool can be waiting for that connection
+        try:
+            while True:
+                items = await AsyncPy2SQL.__run(lambda: list(itertools.islice(generator, chunk_size)))
+                if len(items) == 0:
+                    break
+                for item in items:
+                    yield item
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, generator.close)
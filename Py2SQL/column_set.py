@@ -0,0 +1,174 @@
+"""
+Has the implementation of ColumnSet class
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnSet:
+    """
+    Columnar representation of table rows: values of every column are stored in one typed buffer
+    Integer columns are stored as 64-bit integers, floating point and decimal columns as 64-bit floats
+    and other columns as python objects
+    Buffers are numpy arrays if numpy is used, otherwise array.array for numeric columns and list for others
+    NULL values of numeric columns are stored as 0 and marked in mask of column
+    """
+
+    INTEGER_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint', 'bit', 'year', 'bool', 'boolean')
+    FLOAT_TYPES = ('float', 'double', 'real', 'decimal', 'numeric', 'dec', 'fixed')
+
+    def __init__(self, table: str, columns: List[Tuple[str, str]], values: Sequence[Any],
+                 masks: Sequence[Any or None], length: int) -> None:
+        """
+        Init function
+
+        :param table: table name which rows are stored
+        :param columns: list of tuples (attribute, type),
+        where attribute - name of attribute, type - type of attribute
+        :param values: buffers of column values in order of columns
+        :param masks: buffers of column null flags in order of columns, None if column has no NULL values
+        :param length: count of rows
+        """
+
+        self.table = table
+        self.columns = tuple((name, column_type) for name, column_type in columns)
+        self.length = length
+
+        self.__values: Dict[str, Any] = {column[0]: value for column, value in zip(self.columns, values)}
+        self.__masks: Dict[str, Any] = {column[0]: mask for column, mask in zip(self.columns, masks)}
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """
+        Returns names of columns
+
+        :return: tuple of column names
+        """
+
+        return tuple(column[0] for column in self.columns)
+
+    @property
+    def types(self) -> Tuple[str, ...]:
+        """
+        Returns types of columns
+
+        :return: tuple of column types
+        """
+
+        return tuple(column[1] for column in self.columns)
+
+    def mask(self, name: str) -> Any or None:
+        """
+        Returns null flags of column, flag is 1 (True for numpy) if value is NULL
+
+        :param name: column name
+        :return: buffer of flags or None if column has no NULL values
+        """
+
+        if name not in self.__masks:
+            raise KeyError(name)
+        return self.__masks[name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns buffers of all columns
+
+        :return: dictionary where key is column name and value is buffer of column values
+        """
+
+        return dict(self.__values)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__values
+
+    def __getitem__(self, name: str) -> Any:
+        return self.__values[name]
+
+    def __repr__(self) -> str:
+        return f'ColumnSet(table={self.table!r}, columns={len(self.columns)}, rows={self.length})'
+
+    @staticmethod
+    def typecode(column_type: str) -> str or None:
+        """
+        Returns array.array typecode used to store values of MySQL column type
+
+        :param column_type: type of column, for example int(11) or decimal(10,2) unsigned
+        :return: typecode or None if values are stored as python objects
+        """
+
+        if isinstance(column_type, (bytes, bytearray)):
+            column_type = column_type.decode()
+        words = column_type.lower().replace('(', ' ').split()
+        if len(words) == 0:
+            return None
+        if words[0] in ColumnSet.INTEGER_TYPES:
+            return 'Q' if words[0] == 'bigint' and 'unsigned' in words else 'q'
+        if words[0] in ColumnSet.FLOAT_TYPES:
+            return 'd'
+        return None
+
+    @staticmethod
+    def from_batches(table: str, columns: List[Tuple[str, str]], batches: Iterable[Sequence[Tuple[Any, ...]]],
+                     use_numpy: bool or None = None) -> 'ColumnSet':
+        """
+        Builds ColumnSet from batches of rows, every batch is transposed and appended to column buffers,
+        so rows aren't kept after their batch is processed
+
+        :param table: table name
+        :param columns: list of tuples (attribute, type) in order of row values
+        :param batches: iterable of lists of rows, for example results of cursor.fetchmany
+        :param use_numpy: return numpy arrays, array.array and lists are returned if False,
+        numpy is used if it is installed and use_numpy is None
+        :return: ColumnSet
+        """
+
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise ImportError('numpy isn\'t installed, install symphony_of_nirfolio_py2sql[numpy]')
+
+        typecodes = [ColumnSet.typecode(column[1]) for column in columns]
+        values = [array.array(code) if code is not None else list() for code in typecodes]
+        masks = [None] * len(columns)
+        length = 0
+
+        for batch in batches:
+            for i, column in enumerate(zip(*batch)):
+                if None in column:
+                    if masks[i] is None:
+                        masks[i] = array.array('B', bytes(length))
+                    masks[i].extend(x is None for x in column)
+                    if typecodes[i] is not None:
+                        column = [0 if x is None else x for x in column]
+                elif masks[i] is not None:
+                    masks[i].frombytes(bytes(len(column)))
+                values[i].extend(column)
+            length += len(batch)
+
+        if use_numpy:
+            values = [ColumnSet.__to_numpy(value) for value in values]
+            masks = [None if mask is None else ColumnSet.__to_numpy(mask, bool) for mask in masks]
+
+        return ColumnSet(table, columns, values, masks, length)
+
+    @staticmethod
+    def __to_numpy(buffer, dtype=None):
+        if isinstance(buffer, list):
+            result = numpy.empty(len(buffer), dtype=object)
+            result[:] = buffer
+            return result
+        dtype = dtype if dtype is not None else numpy.dtype(buffer.typecode)
+        if len(buffer) == 0:
+            return numpy.empty(0, dtype=dtype)
+        # Array shares memory of array.array buffer without copying
+        return numpy.frombuffer(buffer, dtype=dtype)
@@ -2,17 +2,60 @@
 Has the implementation of Py2SQL class
 """
 
-from typing import List, Tuple, Any
-
+from collections import deque
+from typing import List, Tuple, Any, Dict, Iterator, NamedTuple, Callable
+
+import ast
+import datetime
+import decimal
+import itertools
+import logging
 import mysql.connector
 import os
-import pyclbr
 import shutil
+import threading
+import time
+import weakref
 
-from importlib import reload
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 from .database_info import DatabaseInfo
+from ._cache import TTLCache
+from ._class_registry import CLASS_REGISTRY, ClassRegistry
+from .column_set import ColumnSet
+from ._connection_pool import ConnectionPool
 from ._init_locker import InitLocker
+from ._instrumentation import INSTRUMENTATION, instrumented
+from ._query_builder import QueryBuilder
+from .refreshable_result_set import RefreshableResultSet
+from ._relations import Relation
+from ._scan_worker import scan_chunk
+from ._snapshot import Snapshot
+from .result_set import ResultSet
+
+
+class ForeignKey(NamedTuple):
+    """
+    Column of foreign key constraint
+    """
+
+    constraint: str
+    table: str
+    column: str
+    referenced_table: str
+    referenced_column: str
+
+
+class SaveReport(NamedTuple):
+    """
+    Result of Py2SQL.save_objects
+    """
+
+    rows: int
+    affected_rows: int
+    batches: int
+    seconds: float
+    rows_per_second: float
 
 
 class Py2SQL(metaclass=InitLocker):
@@ -21,23 +64,41 @@ class Py2SQL(metaclass=InitLocker):
     with the corresponding relational database and various variants of object-relational mapping
     """
 
-    __database_connection = None
+    __connection_pool = None
+    __database_name = None
+    __schema_cache = TTLCache(max_size=1024, ttl=300.0)
+    __class_registry = CLASS_REGISTRY
+    __statement_cache_size = 128
+    __statement_caches = weakref.WeakKeyDictionary()
+    __statement_caches_lock = threading.Lock()
+    __instrumentation = INSTRUMENTATION
+    __identity_map = None
+    __snapshot = (None, frozenset())
+    __snapshot_lock = threading.Lock()
+    __fresh_statistics_connections = weakref.WeakSet()
 
     @staticmethod
-    def db_connect(db: DatabaseInfo) -> None:
+    def db_connect(db: DatabaseInfo, pool_size: int = 1) -> None:
         """
         Establishes a connection to database
+        Every method borrows connection from pool for the duration of call,
+        so up to pool_size methods can be executed concurrently from different threads
+        Unfinished generators of iter_objects_by and iter_class hold their connections, so pool_size
+        must be at least 2 to call other methods while iterating over them,
+        otherwise such calls raise RuntimeError
 
         :param db: parameters to connect to database
+        :param pool_size: maximal count of opened connections to database
         """
 
         if isinstance(db, DatabaseInfo):
-            Py2SQL.__database_connection = mysql.connector.connect(
-                host=db.host,
-                user=db.user,
-                password=db.password,
-                database=db.database
-            )
+            connection_pool = ConnectionPool(db, pool_size)
+            if Py2SQL.__connection_pool is not None:
+                Py2SQL.__connection_pool.close()
+            Py2SQL.__connection_pool = connection_pool
+            Py2SQL.__database_name = db.database
+            Py2SQL.invalidate_objects()
+            Py2SQL.unload_snapshot()
         else:
             raise ValueError('db have to be DatabaseInfo class')
 
@@ -48,10 +109,13 @@ class Py2SQL(metaclass=InitLocker):
         """
 
         Py2SQL.__check_connection()
-        Py2SQL.__database_connection.disconnect()
-        Py2SQL.__database_connection = None
+        Py2SQL.__connection_pool.close()
+        Py2SQL.__connection_pool = None
+        Py2SQL.invalidate_objects()
+        Py2SQL.unload_snapshot()
 
     @staticmethod
+    @instrumented
     def db_engine() -> str:
         """
         Returns database name and version
@@ -64,15 +128,14 @@ class Py2SQL(metaclass=InitLocker):
         
         version = Py2SQL.__select_single_query('SELECT VERSION()')
 
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute('show variables like \'%version%\';')
-        data = cursor.fetchall()
+        data = Py2SQL.__fetch_all('SHOW VARIABLES LIKE %s;', ('%version%',))
 
         version_comment = next(x[1] for x in data if x[0] == 'version_comment')
 
         return 'Version: {0}, Version comment: {1}'.format(version, version_comment)
 
     @staticmethod
+    @instrumented
     def db_name() -> str:
         """
         Returns database name
@@ -85,6 +148,7 @@ class Py2SQL(metaclass=InitLocker):
         return Py2SQL.__select_single_query('SELECT DATABASE()')
 
     @staticmethod
+    @instrumented
     def db_size() -> float:
         """
         Returns database size in Mb
@@ -96,11 +160,12 @@ class Py2SQL(metaclass=InitLocker):
 
         size = Py2SQL.__select_single_query('SELECT ROUND(SUM(data_length + index_length) / 1024 / 1024, 3) '
                                             'FROM information_schema.tables '
-                                            'WHERE table_schema = \'{0}\' '
-                                            'GROUP BY table_schema;'.format(Py2SQL.db_name()))
+                                            'WHERE table_schema = DATABASE() '
+                                            'GROUP BY table_schema;')
         return float(size)
 
     @staticmethod
+    @instrumented
     def db_tables() -> List[str]:
         """
         Returns table name list
@@ -110,12 +175,16 @@ class Py2SQL(metaclass=InitLocker):
 
         Py2SQL.__check_connection()
 
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute('SHOW TABLES')
-        data = cursor.fetchall()
-        return [x[0] for x in data]
+        key = ('tables', Py2SQL.__database_name)
+        tables = Py2SQL.__schema_get(key)
+        if tables is None:
+            data = Py2SQL.__fetch_all('SHOW TABLES')
+            tables = tuple(x[0] for x in data)
+            Py2SQL.__schema_cache.put(key, tables)
+        return list(tables)
 
     @staticmethod
+    @instrumented
     def db_table_structure(table: str) -> List[Tuple[int, str, str]]:
         """
         Returns list of tuples like (id, name, type),
@@ -128,12 +197,230 @@ class Py2SQL(metaclass=InitLocker):
 
         Py2SQL.__check_connection()
 
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute('DESCRIBE {0};'.format(table))
-        data = cursor.fetchall()
-        return [(i, x[0], x[1]) for i, x in enumerate(data)]
+        key = ('structure', Py2SQL.__database_name, table)
+        structure = Py2SQL.__schema_get(key)
+        if structure is None:
+            data = Py2SQL.__fetch_all(f'DESCRIBE {QueryBuilder.quote(table)};')
+            structure = tuple((i, x[0], x[1]) for i, x in enumerate(data))
+            Py2SQL.__schema_cache.put(key, structure)
+        return list(structure)
+
+    @staticmethod
+    @instrumented
+    def load_schema() -> None:
+        """
+        Fills schema cache with names and structures of all tables in current database using single query
+        """
+
+        Py2SQL.__check_connection()
+
+        data = Py2SQL.__fetch_all('SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE '
+                                  'FROM information_schema.COLUMNS '
+                                  'WHERE TABLE_SCHEMA = DATABASE() '
+                                  'ORDER BY TABLE_NAME, ORDINAL_POSITION;')
+
+        structures = dict()
+        for table, name, column_type in data:
+            structure = structures.setdefault(table, [])
+            structure.append((len(structure), name, column_type))
+
+        for table, structure in structures.items():
+            Py2SQL.__schema_cache.put(('structure', Py2SQL.__database_name, table), tuple(structure))
+        Py2SQL.__schema_cache.put(('tables', Py2SQL.__database_name), tuple(structures.keys()))
+
+    @staticmethod
+    def invalidate_schema(table: str or None = None) -> None:
+        """
+        Removes cached schema of current database, so it is read from database on next use
+
+        :param table: table name which structure must be removed or None to remove whole database schema
+        """
+
+        database = Py2SQL.__database_name
+        if table is None:
+            Py2SQL.__schema_cache.invalidate(lambda key: key[1] == database)
+        else:
+            Py2SQL.__schema_cache.invalidate(lambda key: key[1] == database and (len(key) == 2 or key[2] == table))
+        Py2SQL.invalidate_objects(table)
+
+    @staticmethod
+    def configure_schema_cache(max_size: int = 1024, ttl: float or None = 300.0) -> None:
+        """
+        Replaces schema cache with empty one with new limits
+
+        :param max_size: maximal count of cached entries (table list and table structures)
+        :param ttl: time in seconds after which cached entry is read from database again, never if None
+        """
+
+        Py2SQL.__schema_cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    @staticmethod
+    def schema_cache_info() -> Dict[str, Any]:
+        """
+        Returns schema cache statistics
+        Format: {'hits': int, 'misses': int, 'size': int, 'max_size': int, 'ttl': float or None}
+
+        :return: dictionary with schema cache statistics
+        """
+
+        return Py2SQL.__schema_cache.info()
+
+    @staticmethod
+    def configure_statement_cache(max_size: int = 128) -> None:
+        """
+        Sets count of server-side prepared statements cached per connection,
+        statements are reused while their text (statement shape) is the same and only parameters differ
+
+        :param max_size: maximal count of prepared statements per connection, 0 disables prepared statements
+        """
+
+        if type(max_size) != int or max_size < 0:
+            raise ValueError('max_size must be non-negative int')
+
+        with Py2SQL.__statement_caches_lock:
+            Py2SQL.__statement_cache_size = max_size
+            Py2SQL.__statement_caches = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def statement_cache_info() -> Dict[str, int]:
+        """
+        Returns prepared statement cache statistics summed over connections
+        Format: {'hits': int, 'misses': int, 'size': int}
+
+        :return: dictionary with prepared statement cache statistics
+        """
+
+        with Py2SQL.__statement_caches_lock:
+            statement_caches = list(Py2SQL.__statement_caches.values())
+
+        info = {'hits': 0, 'misses': 0, 'size': 0}
+        for statements in statement_caches:
+            for key, value in statements.info().items():
+                if key in info:
+                    info[key] += value
+        return info
+
+    @staticmethod
+    def configure_identity_map(max_size: int = 0, ttl: float or None = None) -> None:
+        """
+        Enables identity map of objects created by create_object, create_objects, iter_objects and create_objects_by_ids
+        Objects are cached by table and id, so create_object of cached id doesn't query database
+        and every row is represented by the same object until it is evicted or invalidated,
+        objects found by other methods are updated with fetched values
+        save_objects and invalidate_schema invalidate objects of their table
+
+        :param max_size: maximal count of cached objects, least recently used object is evicted when it is exceeded,
+        0 disables identity map
+        :param ttl: time in seconds after which object is read from database again, never if None
+        """
+
+        if type(max_size) != int or max_size < 0:
+            raise ValueError('max_size must be non-negative int')
+
+        Py2SQL.__identity_map = TTLCache(max_size=max_size, ttl=ttl) if max_size > 0 else None
+
+    @staticmethod
+    def invalidate_objects(table: str or None = None, ids: List[Any] or None = None) -> int:
+        """
+        Removes objects from identity map, so they are read from database and created again on next use
+
+        :param table: table name which objects must be removed or None to remove objects of all tables
+        :param ids: ids of removed objects of table or None to remove all objects of table
+        :return: count of removed objects
+        """
+
+        identity_map = Py2SQL.__identity_map
+        if identity_map is None:
+            return 0
+
+        database = Py2SQL.__database_name
+        if table is None:
+            return identity_map.invalidate()
+        if ids is None:
+            return identity_map.invalidate(lambda key: key[0] == database and key[1] == table)
+        return identity_map.remove((database, table, id) for id in ids)
+
+    @staticmethod
+    def identity_map_info() -> Dict[str, Any]:
+        """
+        Returns identity map statistics
+        Format: {'hits': int, 'misses': int, 'size': int, 'max_size': int, 'ttl': float or None}
+
+        :return: dictionary with identity map statistics, max_size is 0 if identity map is disabled
+        """
+
+        identity_map = Py2SQL.__identity_map
+        if identity_map is None:
+            return {'hits': 0, 'misses': 0, 'size': 0, 'max_size': 0, 'ttl': None}
+        return identity_map.info()
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """
+        Returns snapshot of instrumentation statistics
+        Format: {'methods': {method: {'calls': int, 'seconds': float, 'round_trips': int, 'server_seconds': float,
+        'rows_fetched': int, 'build_seconds': float, 'cache_hits': int, 'cache_misses': int}},
+        'schema_cache': schema_cache_info(), 'statement_cache': statement_cache_info(),
+        'identity_map': identity_map_info()}
+        Queries are attributed to the outermost public method, seconds are wall time of calls,
+        server_seconds are time spent waiting for database
+
+        :return: dictionary with statistics
+        """
+
+        return {
+            'methods': Py2SQL.__instrumentation.snapshot(),
+            'schema_cache': Py2SQL.schema_cache_info(),
+            'statement_cache': Py2SQL.statement_cache_info(),
+            'identity_map': Py2SQL.identity_map_info()
+        }
+
+    @staticmethod
+    def reset_stats() -> None:
+        """
+        Clears instrumentation statistics
+        """
+
+        Py2SQL.__instrumentation.reset()
+
+    @staticmethod
+    def configure_instrumentation(enabled: bool = True, slow_query_threshold: float or None = None,
+                                  logger: logging.Logger or None = None) -> None:
+        """
+        Configures instrumentation of queries
+
+        :param enabled: collect statistics and call query hooks
+        :param slow_query_threshold: queries executed longer than threshold in seconds are logged, None disables log
+        :param logger: logger for slow queries, logger named Py2SQL is used if None
+        """
+
+        Py2SQL.__instrumentation.enabled = enabled
+        Py2SQL.__instrumentation.slow_query_threshold = slow_query_threshold
+        Py2SQL.__instrumentation.logger = logger if logger is not None else logging.getLogger('Py2SQL')
+
+    @staticmethod
+    def add_query_hook(pre: Callable or None = None, post: Callable or None = None) -> None:
+        """
+        Adds functions called around every SQL query
+
+        :param pre: function (method, query, parameters) called before query
+        :param post: function (method, query, parameters, seconds, rows) called after query
+        """
+
+        Py2SQL.__instrumentation.add_hook(pre, post)
 
     @staticmethod
+    def remove_query_hook(hook: Callable) -> None:
+        """
+        Removes function added by add_query_hook
+
+        :param hook: pre-query or post-query function
+        """
+
+        Py2SQL.__instrumentation.remove_hook(hook)
+
+    @staticmethod
+    @instrumented
     def db_table_size(table: str) -> float:
         """
         Returns table size in Mb
@@ -144,20 +431,23 @@ class Py2SQL(metaclass=InitLocker):
 
         Py2SQL.__check_connection()
 
-        size = Py2SQL.__select_single_query('SELECT ROUND((DATA_LENGTH + INDEX_LENGTH) / 1024 / 1024, 3)'
+        size = Py2SQL.__select_single_query('SELECT ROUND((DATA_LENGTH + INDEX_LENGTH) / 1024 / 1024, 3) '
                                             'FROM information_schema.TABLES '
-                                            'WHERE TABLE_SCHEMA = "{0}" '
-                                            'AND TABLE_NAME = "{1}" '
-                                            'ORDER BY (DATA_LENGTH + INDEX_LENGTH);'.format(Py2SQL.db_name(), table))
+                                            'WHERE TABLE_SCHEMA = DATABASE() '
+                                            'AND TABLE_NAME = %s;', (table,))
         return float(size)
 
     @staticmethod
-    def find_object(table: str, py_object: Any) -> List[Tuple[str, str, str]]:
+    @instrumented
+    def find_object(table: str, py_object: Any, compact: bool = False) -> List[Tuple[str, str, str]] or ResultSet:
         """
         Finds item in table and returns corresponding object
+        If py_object has all columns of primary key or of unique key, other fields of py_object may be omitted,
+        otherwise py_object must have all columns of table
 
         :param table: table name in current database
         :param py_object: python object with fields and their values that must be equivalent to item of the table
+        :param compact: return ResultSet with shared column header and at most one row instead of list of tuples
         :return: list of tuples (attribute, type, value),
         where attribute - name of attribute, type - type of attribute, value - value of attribute
         """
@@ -170,110 +460,463 @@ class Py2SQL(metaclass=InitLocker):
             raise ValueError(f'No such table in database {Py2SQL.db_name()}')
         table_structure = Py2SQL.db_table_structure(table)
         table_field_names = [x[1] for x in table_structure]
-        for argument in py_object.__dict__.keys():
+        object_fields = Py2SQL.__object_fields(py_object)
+        for argument in object_fields.keys():
             if argument not in table_field_names:
                 raise ValueError(f'No field {argument} in table {table}')
 
-        cursor = Py2SQL.__database_connection.cursor()
-        sql_request = 'SELECT * ' \
-                      f'FROM {table} '
-        values = list()
-        if len(py_object.__dict__.keys()) != len(table_structure):
+        key_columns = Py2SQL.__object_key(table, object_fields)
+        if key_columns is None and len(object_fields.keys()) != len(table_structure):
             raise ValueError('Provide full information about object')
-        sql_request += 'WHERE '
-        first_condition = True
-        for key, value in py_object.__dict__.items():
-            s = '' if first_condition else 'AND '
-            first_condition = False
-            s += f'{key} = %s '
-            sql_request += s
-            values.append(value)
-        sql_request += ';'
-        cursor.execute(sql_request, tuple(values))
-        data = cursor.fetchall()
-        result = list()
-        if len(data) == 1:
-            for i in range(len(table_field_names)):
-                result.append((table_structure[i][1], table_structure[i][2], data[0][i]))
-        return result
+        rows = Py2SQL.__snapshot_rows(table)
+        data = Py2SQL.__filter_rows(table_structure, rows, object_fields.items()) if rows is not None else None
+        if data is None:
+            # Columns of key go first, other fields stay in WHERE, so they are compared by SQL rules (type conversion,
+            # collation) while key equality makes the query single row lookup by index
+            names = list(key_columns or ()) + [name for name in object_fields.keys() if name not in (key_columns or ())]
+            query, parameters = QueryBuilder.select(table, [(name, '=', object_fields[name]) for name in names])
+            data = Py2SQL.__fetch_all(query, parameters, prepared=True)
+        with Py2SQL.__instrumentation.building():
+            if compact:
+                return ResultSet(table, Py2SQL.__to_columns(table_structure), data if len(data) == 1 else [])
+            result = list()
+            if len(data) == 1:
+                for i in range(len(table_field_names)):
+                    result.append((table_structure[i][1], table_structure[i][2], data[0][i]))
+            return result
 
     @staticmethod
-    def find_objects_by(table: str, *attributes: Tuple[str, Any]) -> List[List[Tuple[str, str, str]]]:
+    @instrumented
+    def find_objects_by(table: str, *attributes: Tuple[str, Any],
+                        compact: bool = False) -> List[List[Tuple[str, str, str]]] or ResultSet:
         """
         Returns an ordered list of database table table entries
         that contain the attributes specified in the sequence attributes
 
         :param table: table name
         :param attributes: pairs (name, value)
+        :param compact: return ResultSet with shared column header and rows as tuples instead of list of lists
         :return: list of table rows, table row is list of tuples: (attribute, type, value)
         """
 
         Py2SQL.__check_connection()
 
         table_structure = Py2SQL.db_table_structure(table)
-        table_structure_names = [x[1] for x in table_structure]
+        query, parameters = Py2SQL.__objects_by_query(table, table_structure, attributes)
+        rows = Py2SQL.__snapshot_rows(table)
+        all_data = Py2SQL.__filter_rows(table_structure, rows, attributes) if rows is not None else None
+        if all_data is None:
+            all_data = Py2SQL.__fetch_all(query, parameters, prepared=True)
 
-        for attribute in attributes:
-            if attribute[0] not in table_structure_names:
-                raise ValueError('table hasn\'t {0} attribute'.format(attribute[0]))
-
-        where_part = ''
-        for attribute in attributes:
-            where_part += 'T.{0} = "{1}" AND '.format(attribute[0], attribute[1])
-        if len(where_part) != 0:
-            where_part = 'WHERE ' + where_part[: -4]
-
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute('SELECT * '
-                       'FROM {0} AS T '
-                       '{1};'.format(table, where_part))
-        all_data = cursor.fetchall()
-
-        result = []
-        for data in all_data:
-            row = []
-            for i, field in enumerate(table_structure):
-                row.append((field[1], field[2], data[i]))
-            result.append(row)
+        with Py2SQL.__instrumentation.building():
+            if compact:
+                return ResultSet(table, Py2SQL.__to_columns(table_structure), all_data)
+            return [Py2SQL.__to_row(table_structure, data) for data in all_data]
 
-        return result
+    @staticmethod
+    @instrumented
+    def find_refreshable(table: str, *attributes: Tuple[str, Any], timestamp: str or None = None,
+                         checksum: bool = False, append_only: bool = False) -> RefreshableResultSet:
+        """
+        Same as find_objects_by with compact result, but returned RefreshableResultSet can be brought up to date
+        by refresh, which reads only new or changed rows
+        Version of table (UPDATE_TIME from information_schema.TABLES or CHECKSUM TABLE, see snapshot)
+        is read before rows, so refresh skips query while table is unchanged,
+        on MySQL 8 UPDATE_TIME is read with information_schema_stats_expiry = 0, so it isn't cached by server;
+        UPDATE_TIME has precision of one second, so query isn't skipped if table was changed in the current second
+        Rows are always read from database, even if table is in loaded snapshot
+
+        :param table: table name
+        :param attributes: pairs (name, value)
+        :param timestamp: name of column set to current time on every insert and update of row,
+        refresh reads rows with timestamp not less than the last seen one; if None, refresh reads all rows
+        :param checksum: compare CHECKSUM TABLE in addition to UPDATE_TIME, it requires scan of table,
+        but detects changes when UPDATE_TIME isn't reliable
+        :param append_only: rows of table are only inserted, so refresh without timestamp column reads rows
+        with single-column integer primary key greater than the last seen one and reads all rows only if there are
+        no such rows; updates made together with inserts aren't found, table must have such primary key
+        :return: RefreshableResultSet with table rows
+        """
+
+        Py2SQL.__check_connection()
+
+        table_structure = Py2SQL.db_table_structure(table)
+        if timestamp is not None and timestamp not in [x[1] for x in table_structure]:
+            raise ValueError('table hasn\'t {0} attribute'.format(timestamp))
+        query, parameters = Py2SQL.__objects_by_query(table, table_structure, attributes)
+        key_columns = dict(Py2SQL.__unique_keys().get(table, ())).get('PRIMARY', ())
+        if append_only:
+            if timestamp is not None:
+                raise ValueError('append_only can\'t be used with timestamp')
+            types = dict((x[1], x[2]) for x in table_structure)
+            if len(key_columns) != 1 or ColumnSet.typecode(types[key_columns[0]]) not in ('q', 'Q'):
+                raise ValueError('append_only requires single-column integer primary key')
+
+        # Version is read before rows, so changes made while rows are read are found by next refresh
+        version = Py2SQL.__table_versions([table], [table] if checksum else [])[table]
+        all_data = Py2SQL.__fetch_all(query, parameters, prepared=True)
+
+        with Py2SQL.__instrumentation.building():
+            return RefreshableResultSet(table, Py2SQL.__to_columns(table_structure), all_data, attributes,
+                                        key_columns, timestamp, checksum, version, Py2SQL.refresh, append_only)
+
+    @staticmethod
+    @instrumented
+    def refresh(result: RefreshableResultSet, full: bool = False) -> int:
+        """
+        Brings rows of result returned by find_refreshable up to date
+        Nothing is read if version of table is unchanged, otherwise rows with timestamp not less than the last seen
+        one or, for append_only result, with primary key greater than the last seen one are read and merged
+        into result by primary key
+        Table without timestamp column is read entirely unless result is append_only and new rows were found
+        Deleted rows and rows that don't match attributes anymore are removed only when all rows are read
+
+        :param result: result returned by find_refreshable
+        :param full: read all rows again and replace rows of result even if table is unchanged
+        :return: count of read rows, 0 if table is unchanged
+        """
+
+        Py2SQL.__check_connection()
+        if not isinstance(result, RefreshableResultSet):
+            raise TypeError('result must be RefreshableResultSet')
+
+        table = result.table
+        version = Py2SQL.__table_versions([table], [table] if result.checksum else [])[table]
+        if not full and version is not None and version == result.version:
+            return 0
+
+        # Pooled connections are in autocommit mode, so rows aren't read from read view older than version
+        conditions = [(name, '=', value) for name, value in result.attributes]
+        since = None if full else Py2SQL.__refresh_condition(result)
+        if since is not None:
+            data = Py2SQL.__fetch_all(*QueryBuilder.select(table, conditions + [since]), prepared=True)
+            # Without timestamp column version changed by UPDATE or DELETE can be seen only by reading all rows
+            if len(data) == 0 and result.timestamp_column is None:
+                since = None
+        if since is None:
+            data = Py2SQL.__fetch_all(*QueryBuilder.select(table, conditions), prepared=True)
+
+        with Py2SQL.__instrumentation.building():
+            if since is None:
+                result.replace(data)
+            else:
+                result.merge(data)
+        result.version = version
+        return len(data)
+
+    @staticmethod
+    def __refresh_condition(result):
+        # Returns condition that selects rows changed since the last refresh or None if all rows must be read
+        if result.timestamp_column is not None:
+            if len(result.key_columns) > 0 and result.last_timestamp is not None:
+                # Rows changed in the same second as the last seen row are read again and merged by key
+                return result.timestamp_column, '>=', result.last_timestamp
+            return None
+
+        # Without timestamp column changed rows can't be selected, only new rows of append_only table
+        if result.append_only and result.last_key is not None:
+            return result.key_columns[0], '>', result.last_key
+        return None
+
+    @staticmethod
+    @instrumented
+    def iter_objects_by(table: str, *attributes: Tuple[str, Any],
+                        batch_size: int = 1000) -> Iterator[List[Tuple[str, str, str]]]:
+        """
+        Same as find_objects_by, but yields table rows one by one reading them from unbuffered cursor by batches,
+        so memory usage doesn't depend on table size
+        Connection is borrowed from pool until generator is exhausted or closed,
+        so other methods can be called inside the loop only if pool_size of db_connect is at least 2
+
+        :param table: table name
+        :param attributes: pairs (name, value)
+        :param batch_size: count of rows fetched from database at once
+        :return: generator of table rows, table row is list of tuples: (attribute, type, value)
+        """
+
+        Py2SQL.__check_connection()
+        Py2SQL.__check_batch_size(batch_size)
+
+        table_structure = Py2SQL.db_table_structure(table)
+        query, parameters = Py2SQL.__objects_by_query(table, table_structure, attributes)
+
+        for batch in Py2SQL.__stream(query, parameters, batch_size):
+            for data in batch:
+                yield Py2SQL.__to_row(table_structure, data)
+
+    @staticmethod
+    @instrumented
+    def fetch_columns(table: str, *attributes: Tuple[str, Any], columns: List[str] or None = None,
+                      batch_size: int = 1000, use_numpy: bool or None = None) -> ColumnSet:
+        """
+        Same as find_objects_by, but returns columnar result: values of every column are appended to typed buffer
+        directly from batches of unbuffered cursor, so no tuples (attribute, type, value) are created
+        Types of buffers are chosen by types from db_table_structure, see ColumnSet
+
+        :param table: table name
+        :param attributes: pairs (name, value)
+        :param columns: names of fetched columns or None to fetch all columns
+        :param batch_size: count of rows fetched from database at once
+        :param use_numpy: return numpy arrays, array.array and lists are returned if False,
+        numpy is used if it is installed and use_numpy is None
+        :return: ColumnSet with column buffers and null masks
+        """
+
+        Py2SQL.__check_connection()
+        Py2SQL.__check_batch_size(batch_size)
+
+        table_structure = Py2SQL.db_table_structure(table)
+        query, parameters = Py2SQL.__objects_by_query(table, table_structure, attributes, columns)
+        if columns is not None:
+            types = {x[1]: x[2] for x in table_structure}
+            selected_columns = [(name, types[name]) for name in columns]
+        else:
+            selected_columns = Py2SQL.__to_columns(table_structure)
+
+        return ColumnSet.from_batches(table, selected_columns, Py2SQL.__stream(query, parameters, batch_size),
+                                      use_numpy)
 
     @staticmethod
-    def find_class(py_class: Any) -> List[List[Tuple[str, str, str]]]:
+    @instrumented
+    def find_class(py_class: Any, compact: bool = False) -> List[List[Tuple[str, str, str]]] or ResultSet:
         """
         Finds table with same attributes as py_class fields and returns its content
 
         :param py_class: python object which fields used to find a table
+        :param compact: return ResultSet with shared column header and rows as tuples instead of list of lists
         :return: list of table objects represented as list of tuples (attribute, type, value),
         where attribute - name of attribute, type - type of attribute, value - value of attribute
         """
         Py2SQL.__check_connection()
-        attributes = py_class.__dict__.keys()
-        tables = Py2SQL.db_tables()
-        for table in tables:
-            table_structure = Py2SQL.db_table_structure(table)
-            table_attributes = [x[1] for x in table_structure]
-            if len(attributes) == len(table_attributes):
-                is_same = True
-                for attribute in attributes:
-                    if attribute not in table_attributes:
-                        is_same = False
-                        break
-                if is_same:
-                    cursor = Py2SQL.__database_connection.cursor()
-                    cursor.execute('SELECT * '
-                                   f'FROM {table};')
-                    data = cursor.fetchall()
-                    result = list()
-                    for item in data:
-                        item_data = list()
-                        for i in range(len(item)):
-                            item_data.append((table_structure[i][1], table_structure[i][2], item[i]))
-                        result.append(item_data)
-                    return result
-        raise Exception(f'No table corresponding to {type(py_class).__name__} found')
+        table, table_structure = Py2SQL.__find_class_table(py_class)
+
+        data = Py2SQL.__snapshot_rows(table)
+        if data is None:
+            data = Py2SQL.__fetch_all(*QueryBuilder.select(table))
+
+        with Py2SQL.__instrumentation.building():
+            if compact:
+                return ResultSet(table, Py2SQL.__to_columns(table_structure), data)
+            return [Py2SQL.__to_row(table_structure, item) for item in data]
+
+    @staticmethod
+    @instrumented
+    def iter_class(py_class: Any, batch_size: int = 1000) -> Iterator[List[Tuple[str, str, str]]]:
+        """
+        Same as find_class, but yields table objects one by one reading them from unbuffered cursor by batches,
+        so memory usage doesn't depend on table size
+        Connection is borrowed from pool until generator is exhausted or closed,
+        so other methods can be called inside the loop only if pool_size of db_connect is at least 2
+
+        :param py_class: python object which fields used to find a table
+        :param batch_size: count of rows fetched from database at once
+        :return: generator of table objects represented as list of tuples (attribute, type, value),
+        where attribute - name of attribute, type - type of attribute, value - value of attribute
+        """
+
+        Py2SQL.__check_connection()
+        Py2SQL.__check_batch_size(batch_size)
+        table, table_structure = Py2SQL.__find_class_table(py_class)
+
+        for batch in Py2SQL.__stream(*QueryBuilder.select(table), batch_size):
+            for item in batch:
+                yield Py2SQL.__to_row(table_structure, item)
+
+    @staticmethod
+    @instrumented
+    def scan_table(table: str, partitions: int = 4, ordered: bool = True, processes: int or None = None,
+                   batch_size: int = 1000) -> Iterator[List[Tuple[str, str, str]]]:
+        """
+        Reads all rows of table in parallel: range of single-column integer primary key is split into partitions
+        slices of equal width and every slice is read by chunks of batch_size rows (keyset pagination)
+        in worker processes of ProcessPoolExecutor, every worker process uses its own connection
+        Table rows are built by worker processes, the next chunk of slice is read while the previous one is consumed,
+        so at most two chunks of every slice are kept in memory
+        Table without such key is read by one worker process with one query
+        Rows are yielded in order of primary key if ordered is True or in order of completion of chunks otherwise
+
+        :param table: table name
+        :param partitions: count of slices of primary key range
+        :param ordered: yield rows in order of primary key
+        :param processes: maximal count of worker processes or None to start one process per slice
+        :param batch_size: count of rows read by one query of worker process
+        :return: generator of table rows, table row is list of tuples: (attribute, type, value)
+        """
+
+        Py2SQL.__check_connection()
+        if type(partitions) != int or partitions < 1:
+            raise ValueError('partitions must be positive int')
+        if processes is not None and (type(processes) != int or processes < 1):
+            raise ValueError('processes must be positive int or None')
+        Py2SQL.__check_batch_size(batch_size)
+
+        table_structure = Py2SQL.db_table_structure(table)
+
+        data = Py2SQL.__snapshot_rows(table)
+        if data is not None:
+            for item in data:
+                yield Py2SQL.__to_row(table_structure, item)
+            return
+
+        key, slices = Py2SQL.__scan_slices(table, table_structure, partitions)
+        if len(slices) == 0:
+            return
+
+        db = Py2SQL.__connection_pool.db
+        columns = Py2SQL.__to_columns(table_structure)
+        key_index = [x[1] for x in table_structure].index(key) if key is not None else None
+        executor = ProcessPoolExecutor(max_workers=min(processes or len(slices), len(slices)))
+        futures = dict()
+
+        def submit(index, last_key):
+            if key is None:
+                query, parameters = QueryBuilder.select(table)
+            else:
+                conditions = slices[index] + ([(key, '>', last_key)] if last_key is not None else [])
+                query, parameters = QueryBuilder.select(table, conditions, order_by=key, limit=batch_size)
+            Py2SQL.__instrumentation.before_query(query, parameters)
+            future = executor.submit(scan_chunk, db, query, parameters, columns, key_index)
+            futures[future] = (index, query, parameters)
+            return future
+
+        def collect(future):
+            # Returns rows of chunk and future of the next chunk of the same slice or None
+            index, query, parameters = futures.pop(future)
+            rows, last_key, seconds = future.result()
+            # Query was timed by worker process, so start is shifted to get the same duration
+            Py2SQL.__instrumentation.after_query(query, parameters, time.perf_counter() - seconds, len(rows))
+            if key is None or len(rows) < batch_size:
+                return rows, None
+            return rows, submit(index, last_key)
+
+        try:
+            first_futures = [submit(index, None) for index in range(len(slices))]
+            if ordered:
+                for future in first_futures:
+                    while future is not None:
+                        rows, future = collect(future)
+                        yield from rows
+            else:
+                while len(futures) > 0:
+                    done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        rows, _ = collect(future)
+                        yield from rows
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def __scan_slices(table, table_structure, partitions):
+        # Returns tuple (key, slices), where slices are conditions of ranges of single-column integer primary key,
+        # the last slice includes its upper bound, table without rows has no slices,
+        # key is None and there is one slice without conditions if table hasn't such key
+        types = {x[1]: x[2] for x in table_structure}
+        key_columns = dict(Py2SQL.__unique_keys().get(table, ())).get('PRIMARY', ())
+        if len(key_columns) != 1 or ColumnSet.typecode(types[key_columns[0]]) not in ('q', 'Q'):
+            return None, [[]]
+
+        key = key_columns[0]
+        quoted_key = QueryBuilder.quote(key)
+        lower, upper = Py2SQL.__fetch_all(f'SELECT MIN({quoted_key}), MAX({quoted_key}) '
+                                          f'FROM {QueryBuilder.quote(table)};')[0]
+        if lower is None:
+            return key, []
+
+        step = -(-(upper - lower + 1) // partitions)
+        slices = list()
+        for start in range(lower, upper + 1, step):
+            if start + step > upper:
+                slices.append([(key, '>=', start), (key, '<=', upper)])
+            else:
+                slices.append([(key, '>=', start), (key, '<', start + step)])
+        return key, slices
+
+    @staticmethod
+    def __find_class_table(py_class):
+        signature = frozenset(Py2SQL.__object_fields(py_class).keys())
+        table = Py2SQL.__column_index()[1].get(signature)
+        if table is None:
+            raise Exception(f'No table corresponding to {type(py_class).__name__} found')
+        return table, Py2SQL.db_table_structure(table)
+
+    @staticmethod
+    def __column_index():
+        # Returns tuple (tables_by_column, table_by_signature), where tables_by_column maps column name
+        # to set of tables with it and table_by_signature maps set of column names to the first table with them
+        key = ('column_index', Py2SQL.__database_name)
+        column_index = Py2SQL.__schema_get(key)
+        if column_index is None:
+            tables = Py2SQL.__schema_get(('tables', Py2SQL.__database_name))
+            if tables is None:
+                Py2SQL.load_schema()
+            tables = Py2SQL.db_tables()
+            Py2SQL.__preload_structures(tables)
+
+            tables_by_column = dict()
+            table_by_signature = dict()
+            for table in tables:
+                column_names = [x[1] for x in Py2SQL.db_table_structure(table)]
+                for name in column_names:
+                    tables_by_column.setdefault(name, set()).add(table)
+                table_by_signature.setdefault(frozenset(column_names), table)
+
+            column_index = ({name: frozenset(names) for name, names in tables_by_column.items()}, table_by_signature)
+            Py2SQL.__schema_cache.put(key, column_index)
+        return column_index
+
+    @staticmethod
+    def __objects_by_query(table, table_structure, attributes, columns=None):
+        table_structure_names = [x[1] for x in table_structure]
+
+        for name in [attribute[0] for attribute in attributes] + list(columns or ()):
+            if name not in table_structure_names:
+                raise ValueError('table hasn\'t {0} attribute'.format(name))
+
+        return QueryBuilder.select(table, [(attribute[0], '=', attribute[1]) for attribute in attributes],
+                                   columns=columns)
+
+    @staticmethod
+    def __to_columns(table_structure):
+        return [(field[1], field[2]) for field in table_structure]
+
+    @staticmethod
+    def __to_row(table_structure, data):
+        return [(field[1], field[2], data[i]) for i, field in enumerate(table_structure)]
+
+    @staticmethod
+    def __stream(query, parameters, batch_size):
+        # Connection is taken directly from pool, because generator can be suspended
+        # while the same thread calls other methods, it is returned to the same pool after reconnection
+        pool = Py2SQL.__connection_pool
+        connection = pool.checkout()
+        exhausted = False
+        try:
+            cursor = connection.cursor(buffered=False)
+            start = Py2SQL.__instrumentation.before_query(query, parameters)
+            cursor.execute(query, parameters)
+            Py2SQL.__instrumentation.after_query(query, parameters, start, 0)
+            while True:
+                start = time.perf_counter()
+                batch = cursor.fetchmany(batch_size)
+                Py2SQL.__instrumentation.add_rows(len(batch), time.perf_counter() - start)
+                if len(batch) == 0:
+                    break
+                yield batch
+                pool.claim(connection)
+            exhausted = True
+        finally:
+            # Connection with partially read result is closed instead of reading the rest of table
+            pool.checkin(connection, discard=not exhausted)
+
+    @staticmethod
+    def __check_batch_size(batch_size):
+        if type(batch_size) != int or batch_size < 1:
+            raise ValueError('batch_size must be positive int')
 
     @staticmethod
+    @instrumented
     def find_classes_by(*attributes: Tuple[str, ...]) -> List[List[Tuple[str, str]]]:
         """
         Finds tables which have attributes and returns their structure
@@ -283,28 +926,26 @@ class Py2SQL(metaclass=InitLocker):
         where attribute - name of attribute, type - type of attribute
         """
         Py2SQL.__check_connection()
+        for attribute_tuple in attributes:
+            if type(attribute_tuple) != tuple:
+                raise Exception(f'{attribute_tuple}: all attributes must be tuple')
+            if len(attribute_tuple) < 1:
+                raise Exception(f'{attribute_tuple}: no name in attribute')
+
+        tables_by_column = Py2SQL.__column_index()[0]
         tables = Py2SQL.db_tables()
-        result = list()
-        for table in tables:
-            table_structure = Py2SQL.db_table_structure(table)
-            table_attributes = [x[1] for x in table_structure]
-            is_table_match = True
-            for attribute_tuple in attributes:
-                if type(attribute_tuple) != tuple:
-                    raise Exception(f'{attribute_tuple}: all attributes must be tuple')
-                if len(attribute_tuple) < 1:
-                    raise Exception(f'{attribute_tuple}: no name in attribute')
-                attribute = attribute_tuple[0]
-                if attribute not in table_attributes:
-                    is_table_match = False
-            if is_table_match:
-                result.append([(x[1], x[2]) for x in table_structure])
-        return result
+        matched_tables = set(tables)
+        for attribute_tuple in attributes:
+            matched_tables &= tables_by_column.get(attribute_tuple[0], frozenset())
+
+        return [Py2SQL.__to_columns(Py2SQL.db_table_structure(table)) for table in tables if table in matched_tables]
 
     @staticmethod
+    @instrumented
     def create_object(table: str, id: int) -> Any or None:
         """
         Creates new object with id value from table
+        If identity map is enabled, cached object is returned without query, see configure_identity_map
 
         :param table: table name
         :param id: id of object in table
@@ -313,27 +954,36 @@ class Py2SQL(metaclass=InitLocker):
 
         Py2SQL.__check_connection()
 
-        cursor = Py2SQL.__database_connection.cursor()
-        try:
-            cursor.execute("SELECT * "
-                           "FROM " + table +
-                           " WHERE id = " + str(id) + ";")
-        except:
-            print("Field id doesn't exist in this table")
-            return None
+        identity_map = Py2SQL.__identity_map
+        if identity_map is not None:
+            py_object = identity_map.get((Py2SQL.__database_name, table, id))
+            if py_object is not None:
+                return py_object
+
+        snapshot = Py2SQL.__table_snapshot(table)
+        id_types = [column[2] for column in Py2SQL.db_table_structure(table) if column[1] == 'id']
+        if snapshot is not None and len(id_types) > 0 and Py2SQL.__comparable(id_types[0], id):
+            row = snapshot.row_by_id(table, id)
+            data = [row] if row is not None else []
+        else:
+            query, parameters = QueryBuilder.select(table, [('id', '=', id)])
+            try:
+                data = Py2SQL.__fetch_all(query, parameters, prepared=True)
+            except mysql.connector.errors.ProgrammingError:
+                print("Field id doesn't exist in this table")
+                return None
 
-        value = cursor.fetchone()
-        if value is None:
+        if len(data) == 0:
             return None
+        value = data[0]
 
-        table_camel = Py2SQL.__to_camel_case(table)
-
-        if table_camel not in globals():
-            Py2SQL.create_class(table, Py2SQL.__to_snake_case(table))
-
-        return globals()[table_camel](*value)
+        table_class = Py2SQL.__table_class(table)
+        id_index = getattr(table_class, ClassRegistry.COLUMNS_ATTRIBUTE).index('id')
+        with Py2SQL.__instrumentation.building():
+            return Py2SQL.__mapped_object(table, table_class, value, id_index)
 
     @staticmethod
+    @instrumented
     def create_objects(table: str, fid: int, lid: int) -> List[Any]:
         """
         Creates list of objects from table with id from fid to lid included
@@ -354,42 +1004,583 @@ class Py2SQL(metaclass=InitLocker):
         if 'id' not in table_attributes:
             raise Exception('Field id doesn\'t exist in this table')
 
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute('SELECT *' 
-                       f'FROM {table} '
-                       f'WHERE id >= {fid} AND id <= {lid};')
-        data = cursor.fetchall()
+        id_index = table_attributes.index('id')
+        rows = Py2SQL.__snapshot_rows(table)
+        if rows is not None:
+            data = [row for row in rows if fid <= row[id_index] <= lid]
+        else:
+            query, parameters = QueryBuilder.select(table, [('id', '>=', fid), ('id', '<=', lid)])
+            data = Py2SQL.__fetch_all(query, parameters, prepared=True)
 
-        table_class_name = Py2SQL.__to_camel_case(table)
+        table_class = Py2SQL.__table_class(table)
 
-        if table_class_name not in globals():
-            Py2SQL.create_class(table, Py2SQL.__to_snake_case(table))
+        with Py2SQL.__instrumentation.building():
+            return Py2SQL.__mapped_objects(table, table_class, data, id_index)
 
-        result = list()
-        for item in data:
-            result.append(globals()[table_class_name](*item))
-        return result
+    @staticmethod
+    @instrumented
+    def iter_objects(table: str, fid: int, lid: int, page_size: int = 1000, prefetch: bool = False) -> Iterator[Any]:
+        """
+        Lazily creates objects from table with id from fid to lid included in order of id
+        Rows are read by pages of page_size rows using keyset pagination (WHERE id > last_id ORDER BY id LIMIT n),
+        so every page is an index range scan regardless of its position
+
+        :param table: table name in current database
+        :param fid: first id of table item to be created
+        :param lid: last id of table item to be created
+        :param page_size: count of rows read from database by one query
+        :param prefetch: read next page in background thread while current page is consumed
+        :return: generator of objects from table with id from fid to lid included
+        """
+        Py2SQL.__check_connection()
+        if type(table) != str:
+            raise TypeError('table must be str')
+        if type(fid) != int or type(lid) != int:
+            raise TypeError('fid and lid must be int')
+        if type(page_size) != int or page_size < 1:
+            raise ValueError('page_size must be positive int')
+
+        table_structure = Py2SQL.db_table_structure(table)
+        table_attributes = [x[1] for x in table_structure]
+        if 'id' not in table_attributes:
+            raise Exception('Field id doesn\'t exist in this table')
+        id_index = table_attributes.index('id')
+
+        table_class = Py2SQL.__table_class(table)
+
+        def read_page(first_condition, first_id):
+            query, parameters = QueryBuilder.select(table, [('id', first_condition, first_id), ('id', '<=', lid)],
+                                                    order_by='id', limit=page_size)
+            # Prefetched pages are read in other thread, so they are attributed to iter_objects explicitly
+            with Py2SQL.__instrumentation.context('iter_objects'):
+                return Py2SQL.__fetch_all(query, parameters, prepared=True)
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = read_page('>=', fid)
+            while len(page) > 0:
+                next_page = None
+                if len(page) == page_size:
+                    if executor is not None:
+                        next_page = executor.submit(read_page, '>', page[-1][id_index])
+                    else:
+                        next_page = page[-1][id_index]
+
+                yield from Py2SQL.__mapped_objects(table, table_class, page, id_index)
+
+                if next_page is None:
+                    break
+                page = next_page.result() if executor is not None else read_page('>', next_page)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    @staticmethod
+    @instrumented
+    def create_objects_by_ids(table: str, ids: List[Any], batch_size: int = 1000) -> Tuple[List[Any], List[Any]]:
+        """
+        Creates objects from table by list of ids using one query with WHERE id IN (...) per batch_size ids
+
+        :param table: table name in current database
+        :param ids: ids of objects in table, values must have the same type as values of id column
+        :param batch_size: maximal count of ids in one query
+        :return: tuple (objects, missing_ids), where objects - created objects in order of ids,
+        missing_ids - ids which aren't found in table in order of ids
+        """
+        Py2SQL.__check_connection()
+        if type(table) != str:
+            raise TypeError('table must be str')
+        Py2SQL.__check_batch_size(batch_size)
+
+        table_structure = Py2SQL.db_table_structure(table)
+        table_attributes = [x[1] for x in table_structure]
+        if 'id' not in table_attributes:
+            raise Exception('Field id doesn\'t exist in this table')
+        id_index = table_attributes.index('id')
+
+        ids = list(ids)
+        unique_ids = list(dict.fromkeys(ids))
+        items_by_id = dict()
+        for start in range(0, len(unique_ids), batch_size):
+            query, parameters = QueryBuilder.select(table, [('id', 'IN', unique_ids[start: start + batch_size])])
+            for item in Py2SQL.__fetch_all(query, parameters, prepared=True):
+                items_by_id[item[id_index]] = item
+
+        table_class = Py2SQL.__table_class(table)
+
+        with Py2SQL.__instrumentation.building():
+            objects = list()
+            missing_ids = list()
+            for id in ids:
+                item = items_by_id.get(id)
+                if item is None:
+                    missing_ids.append(id)
+                else:
+                    objects.append(Py2SQL.__mapped_object(table, table_class, item, id_index))
+            return objects, missing_ids
+
+    @staticmethod
+    @instrumented
+    def save_objects(table: str, objects: Iterator[Any], batch_size: int = 1000, upsert: bool = False,
+                     single_transaction: bool = False) -> SaveReport:
+        """
+        Inserts objects into table as rows, one multi-row INSERT per batch_size objects
+        Object fields must be table columns and all objects must have the same fields
+        Objects with saved ids are removed from identity map, table is no longer read from loaded snapshot
+
+        :param table: table name in current database
+        :param objects: objects to save, may be generator
+        :param batch_size: count of rows in one INSERT statement
+        :param upsert: update rows with the same primary or unique key (INSERT ... ON DUPLICATE KEY UPDATE)
+        :param single_transaction: commit all batches at once instead of committing every batch,
+        nothing is saved if any batch fails
+        :return: SaveReport(rows, affected_rows, batches, seconds, rows_per_second),
+        where affected_rows counts updated rows twice as MySQL does
+        """
+        Py2SQL.__check_connection()
+        if type(table) != str:
+            raise TypeError('table must be str')
+        Py2SQL.__check_batch_size(batch_size)
+
+        table_field_names = [x[1] for x in Py2SQL.db_table_structure(table)]
+        with Py2SQL.__snapshot_lock:
+            snapshot, snapshot_tables = Py2SQL.__snapshot
+            Py2SQL.__snapshot = (snapshot, snapshot_tables - {table})
+
+        start = time.perf_counter()
+        objects = iter(objects)
+        columns = None
+        query = None
+        rows = 0
+        affected_rows = 0
+        batches = 0
+
+        with Py2SQL.__connection() as connection:
+            try:
+                # Pooled connections are in autocommit mode, so batches are grouped by explicit transactions
+                connection.start_transaction()
+                while True:
+                    batch = list(itertools.islice(objects, batch_size))
+                    if len(batch) == 0:
+                        break
+
+                    values = list()
+                    for py_object in batch:
+                        object_fields = Py2SQL.__object_fields(py_object)
+                        if columns is None:
+                            for argument in object_fields.keys():
+                                if argument not in table_field_names:
+                                    raise ValueError(f'No field {argument} in table {table}')
+                            columns = [name for name in table_field_names if name in object_fields]
+                            query = QueryBuilder.insert(table, columns, columns if upsert else None)
+                        elif len(object_fields) != len(columns) or any(name not in object_fields for name in columns):
+                            raise ValueError('All objects must have the same fields')
+                        values.append(tuple(object_fields[name] for name in columns))
+
+                    cursor = connection.cursor()
+                    query_start = Py2SQL.__instrumentation.before_query(query, values)
+                    cursor.executemany(query, values)
+                    Py2SQL.__instrumentation.after_query(query, values, query_start, 0)
+                    if 'id' in columns:
+                        id_index = columns.index('id')
+                        Py2SQL.invalidate_objects(table, [value[id_index] for value in values])
+                    affected_rows += max(cursor.rowcount, 0)
+                    rows += len(values)
+                    batches += 1
+                    if not single_transaction:
+                        connection.commit()
+                        connection.start_transaction()
+
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+
+        seconds = time.perf_counter() - start
+        return SaveReport(rows, affected_rows, batches, seconds, rows / seconds if seconds > 0 else 0.0)
+
+    @staticmethod
+    @instrumented
+    def snapshot(tables: List[str], path: str, checksum: bool = False) -> None:
+        """
+        Writes structures and rows of tables to binary file which can be loaded by load_snapshot
+        Version of every table is stored with its rows to detect stale snapshot:
+        UPDATE_TIME from information_schema.TABLES and CHECKSUM TABLE if UPDATE_TIME isn't available,
+        on MySQL 8 UPDATE_TIME is read with information_schema_stats_expiry = 0, so it isn't cached by server;
+        UPDATE_TIME has precision of one second, so table changed in the current second is never fresh
+
+        :param tables: names of tables
+        :param path: path of snapshot file
+        :param checksum: store CHECKSUM TABLE of every table, it requires scan of table, but detects changes
+        when UPDATE_TIME isn't reliable
+        """
+
+        Py2SQL.__check_connection()
+
+        tables = list(tables)
+        database_tables = Py2SQL.db_tables()
+        for table in tables:
+            if table not in database_tables:
+                raise ValueError(f'No table {table} in database {Py2SQL.__database_name}')
+
+        # Versions are read before rows, so changes made during snapshot make it stale
+        versions = Py2SQL.__table_versions(tables, tables if checksum else ())
+        contents = list()
+        for table in tables:
+            rows = Py2SQL.__fetch_all(*QueryBuilder.select(table))
+            contents.append((table, Py2SQL.db_table_structure(table), versions[table], rows))
+
+        Snapshot.write(path, Py2SQL.__database_name, contents)
+
+    @staticmethod
+    @instrumented
+    def load_snapshot(path: str, verify: bool = True) -> List[str]:
+        """
+        Memory-maps snapshot file written by snapshot method, so find_object, find_objects_by, find_class,
+        create_object and create_objects read tables of snapshot from it instead of database
+        Table structures of snapshot are added to schema cache
+        Values are compared with python == instead of SQL comparison, tables are read from database if type of value
+        differs from type of column values
+
+        :param path: path of snapshot file
+        :param verify: compare versions of tables with current versions and use only tables that weren't changed,
+        it takes one query (and CHECKSUM TABLE of tables which checksum was stored)
+        :return: names of tables which are read from snapshot
+        """
+
+        Py2SQL.__check_connection()
+
+        snapshot = Snapshot(path)
+        if snapshot.database != Py2SQL.__database_name:
+            snapshot.close()
+            raise ValueError(f'Snapshot of database {snapshot.database} can\'t be used with {Py2SQL.__database_name}')
+
+        try:
+            tables = Py2SQL.__fresh_tables(snapshot) if verify else snapshot.tables
+        except BaseException:
+            snapshot.close()
+            raise
+
+        # Snapshot and its tables are published together, so readers never see tables of other snapshot;
+        # previous snapshot isn't closed, because other threads can still read it, it is unmapped by garbage collector
+        with Py2SQL.__snapshot_lock:
+            Py2SQL.__snapshot = (snapshot, frozenset(tables))
+
+        for table in tables:
+            Py2SQL.__schema_cache.put(('structure', Py2SQL.__database_name, table), tuple(snapshot.structure(table)))
+        return tables
+
+    @staticmethod
+    @instrumented
+    def check_snapshot() -> List[str]:
+        """
+        Compares versions of tables of loaded snapshot with current versions, changed tables are read from database
+
+        :return: names of tables which are still read from snapshot
+        """
+
+        Py2SQL.__check_connection()
+
+        snapshot = Py2SQL.__snapshot[0]
+        if snapshot is None:
+            return list()
+        fresh_tables = Py2SQL.__fresh_tables(snapshot)
+
+        with Py2SQL.__snapshot_lock:
+            current_snapshot, snapshot_tables = Py2SQL.__snapshot
+            if current_snapshot is not snapshot:
+                return list(snapshot_tables)
+            tables = [table for table in fresh_tables if table in snapshot_tables]
+            Py2SQL.__snapshot = (snapshot, frozenset(tables))
+        return tables
 
     @staticmethod
-    def create_class(table: str, module: str) -> None:
+    def unload_snapshot() -> None:
+        """
+        Unloads loaded snapshot, all tables are read from database
+        File is unmapped when snapshot isn't used by other threads anymore
         """
-        Creates class with field names from table column names in module
+
+        with Py2SQL.__snapshot_lock:
+            Py2SQL.__snapshot = (None, frozenset())
+
+    @staticmethod
+    def __snapshot_rows(table):
+        snapshot = Py2SQL.__table_snapshot(table)
+        if snapshot is None:
+            return None
+        return snapshot.rows(table)
+
+    @staticmethod
+    def __table_snapshot(table):
+        # Returns loaded snapshot if table is read from it, otherwise None
+        snapshot, tables = Py2SQL.__snapshot
+        if table not in tables:
+            return None
+        return snapshot
+
+    @staticmethod
+    def __filter_rows(table_structure, rows, attributes):
+        # Returns rows with values equal to attributes or None if some value can't be compared with python ==,
+        # then rows must be filtered by SQL
+        table_field_names = [x[1] for x in table_structure]
+        conditions = [(table_field_names.index(name), value) for name, value in attributes]
+        if not all(Py2SQL.__comparable(table_structure[i][2], value) for i, value in conditions):
+            return None
+        if len(conditions) == 0:
+            return list(rows)
+        return [row for row in rows if all(Py2SQL.__same_value(row[i], value) for i, value in conditions)]
+
+    @staticmethod
+    def __comparable(column_type, value):
+        # Value is compared with column values by python == only if it has type of values of column,
+        # SQL converts other values (for example string '3' is equal to 3 in integer column)
+        if value is None:
+            return True
+        if isinstance(column_type, (bytes, bytearray)):
+            column_type = column_type.decode()
+        words = column_type.lower().replace('(', ' ').split()
+        base_type = words[0] if len(words) > 0 else ''
+        if base_type in ColumnSet.INTEGER_TYPES or base_type in ColumnSet.FLOAT_TYPES:
+            return isinstance(value, (int, float, decimal.Decimal))
+        if base_type in ('char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext', 'enum', 'set'):
+            return isinstance(value, str)
+        if base_type in ('binary', 'varbinary', 'tinyblob', 'blob', 'mediumblob', 'longblob'):
+            return isinstance(value, (bytes, bytearray))
+        if base_type == 'date':
+            return type(value) == datetime.date
+        if base_type in ('datetime', 'timestamp'):
+            return isinstance(value, datetime.datetime)
+        if base_type == 'time':
+            return isinstance(value, datetime.timedelta)
+        return False
+
+    @staticmethod
+    def __same_value(value, expected):
+        # DECIMAL values are compared with float by decimal representation of float, as MySQL compares literals
+        if isinstance(value, decimal.Decimal) and isinstance(expected, float):
+            return value == decimal.Decimal(repr(expected))
+        if isinstance(value, float) and isinstance(expected, decimal.Decimal):
+            return decimal.Decimal(repr(value)) == expected
+        return value == expected
+
+    @staticmethod
+    def __object_key(table, object_fields):
+        # Returns columns of primary key or first unique key which values are all present and not NULL in object
+        for _, key_columns in Py2SQL.__unique_keys().get(table, ()):
+            if all(object_fields.get(column) is not None for column in key_columns):
+                return key_columns
+        return None
+
+    @staticmethod
+    def __unique_keys():
+        # Returns dictionary where key is table name and value is tuple of unique keys (index name, tuple of columns),
+        # primary key named PRIMARY goes first
+        key = ('indexes', Py2SQL.__database_name)
+        unique_keys = Py2SQL.__schema_get(key)
+        if unique_keys is None:
+            data = Py2SQL.__fetch_all('SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SEQ_IN_INDEX '
+                                      'FROM information_schema.STATISTICS '
+                                      'WHERE TABLE_SCHEMA = DATABASE() '
+                                      'ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX;')
+            indexes = dict()
+            for table, index, non_unique, column, _ in data:
+                if int(non_unique) == 0:
+                    indexes.setdefault(table, dict()).setdefault(index, []).append(column)
+
+            unique_keys = dict()
+            for table, table_indexes in indexes.items():
+                names = sorted(table_indexes, key=lambda name: (name != 'PRIMARY', name))
+                unique_keys[table] = tuple((name, tuple(table_indexes[name])) for name in names)
+            Py2SQL.__schema_cache.put(key, unique_keys)
+        return unique_keys
+
+    @staticmethod
+    def __fresh_tables(snapshot):
+        tables = snapshot.tables
+        versions = Py2SQL.__table_versions(tables, [x for x in tables if snapshot.version(x) is not None
+                                                    and snapshot.version(x)[1] is not None])
+        return [table for table in tables
+                if versions[table] is not None and versions[table] == snapshot.version(table)]
+
+    @staticmethod
+    def __table_versions(tables, checksum_tables):
+        # Returns dictionary where key is table name and value is list [update_time, checksum] or None if version
+        # is unknown, checksum is read for checksum_tables and for tables without UPDATE_TIME
+        # UPDATE_TIME has precision of one second, so table changed in the current second can be changed again
+        # without changing its version, version of such table is unknown
+        update_times = dict()
+        unknown_tables = set()
+        if len(tables) > 0:
+            where_part, parameters = QueryBuilder.where([('TABLE_NAME', 'IN', tables)])
+            with Py2SQL.__connection() as connection:
+                Py2SQL.__disable_statistics_cache(connection)
+                data = Py2SQL.__fetch_all('SELECT TABLE_NAME, UPDATE_TIME, NOW() FROM information_schema.TABLES' +
+                                          where_part + ' AND TABLE_SCHEMA = DATABASE();', parameters)
+            update_times = {name: update_time for name, update_time, _ in data if update_time is not None}
+            unknown_tables = {name for name, update_time, now in data
+                              if update_time is not None and update_time >= now}
+
+        versions = dict()
+        for table in tables:
+            if table in unknown_tables:
+                versions[table] = None
+                continue
+            update_time = update_times.get(table)
+            checksum = None
+            if update_time is None or table in checksum_tables:
+                checksum = Py2SQL.__fetch_all(f'CHECKSUM TABLE {QueryBuilder.quote(table)};')[0][1]
+            versions[table] = [str(update_time) if update_time is not None else None, checksum]
+        return versions
+
+    @staticmethod
+    def __disable_statistics_cache(connection):
+        # MySQL 8 caches UPDATE_TIME of information_schema.TABLES for information_schema_stats_expiry seconds
+        # (one day by default), so cache is disabled once per connection, older servers don't have the variable
+        if connection in Py2SQL.__fresh_statistics_connections:
+            return
+
+        query = 'SET SESSION information_schema_stats_expiry = 0;'
+        start = Py2SQL.__instrumentation.before_query(query, None)
+        try:
+            connection.cursor().execute(query)
+        except mysql.connector.Error as e:
+            if e.errno != mysql.connector.errorcode.ER_UNKNOWN_SYSTEM_VARIABLE:
+                raise
+        Py2SQL.__instrumentation.after_query(query, None, start, 0)
+        Py2SQL.__fresh_statistics_connections.add(connection)
+
+    @staticmethod
+    @instrumented
+    def create_class(table: str, module: str or None = None) -> type:
+        """
+        Creates class with field names from table column names and registers it in memory,
+        generated class has __slots__ and __init__ that takes field values in order of table columns
+        If module is given, source of class is also added to module
 
         :param table: table name
-        :param module: name of module where to add new class
+        :param module: name of module where to add new class or None to keep class only in memory
+        :return: created class
         """
 
         Py2SQL.__check_connection()
 
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute("SHOW COLUMNS FROM " + table + ";")
+        table_class = Py2SQL.__table_class(table)
+        if module is not None:
+            Py2SQL.__export_class(table_class, module + '.py')
+        return table_class
+
+    @staticmethod
+    def __table_class(table):
+        column_names = [column[1] for column in Py2SQL.db_table_structure(table)]
+        table_class = Py2SQL.__class_registry.register((Py2SQL.__database_name, table),
+                                                       Py2SQL.__to_camel_case(table), column_names)
+        if Relation.RELATIONS_ATTRIBUTE not in table_class.__dict__:
+            Py2SQL.__attach_relations(table, table_class)
+        return table_class
+
+    @staticmethod
+    def __attach_relations(table, table_class):
+        # Forward relation is named by singular referenced table and reverse relation by referencing table,
+        # names of self-references and names that clash with columns or other attributes are qualified by column,
+        # composite keys are skipped
+        column_names = getattr(table_class, ClassRegistry.COLUMNS_ATTRIBUTE)
+        foreign_keys = Py2SQL.__foreign_keys()
+        key_sizes = dict()
+        for foreign_key in foreign_keys:
+            key = (foreign_key.table, foreign_key.constraint)
+            key_sizes[key] = key_sizes.get(key, 0) + 1
+
+        relations = dict()
+
+        def add(names, column, target_table, target_column, many):
+            for name in names:
+                if name not in column_names and name not in relations and not hasattr(table_class, name):
+                    relations[name] = Relation(name, column, target_table, target_column, many, Py2SQL.__load_relation)
+                    return
+
+        for foreign_key in foreign_keys:
+            if key_sizes[(foreign_key.table, foreign_key.constraint)] > 1:
+                continue
+            # Unqualified names of self-reference (employee.employee, employee.employees) don't tell direction
+            self_reference = foreign_key.table == foreign_key.referenced_table
+            if foreign_key.table == table:
+                singular = Relation.singular(foreign_key.referenced_table)
+                names = [f'{foreign_key.column}_{singular}']
+                add(names if self_reference else [singular] + names, foreign_key.column,
+                    foreign_key.referenced_table, foreign_key.referenced_column, False)
+            if foreign_key.referenced_table == table:
+                names = [f'{foreign_key.table}_by_{foreign_key.column}']
+                add(names if self_reference else [foreign_key.table] + names, foreign_key.referenced_column,
+                    foreign_key.table, foreign_key.column, True)
+
+        for name, relation in relations.items():
+            setattr(table_class, name, relation)
+        setattr(table_class, Relation.RELATIONS_ATTRIBUTE, relations)
+
+    @staticmethod
+    def __load_relation(relation, objects):
+        with Py2SQL.__instrumentation.context('prefetch'):
+            Py2SQL.__check_connection()
+
+            keys = list(dict.fromkeys(getattr(py_object, relation.column) for py_object in objects))
+            if None in keys:
+                keys.remove(None)
+
+            target_class = Py2SQL.__table_class(relation.target_table)
+            target_columns = getattr(target_class, ClassRegistry.COLUMNS_ATTRIBUTE)
+            target_index = target_columns.index(relation.target_column)
+            id_index = target_columns.index('id') if 'id' in target_columns else None
+
+            data = list()
+            if len(keys) > 0:
+                rows = Py2SQL.__snapshot_rows(relation.target_table)
+                if rows is not None:
+                    key_set = set(keys)
+                    data = [row for row in rows if row[target_index] in key_set]
+                else:
+                    for start in range(0, len(keys), 1000):
+                        data.extend(Py2SQL.__fetch_all(*QueryBuilder.select(
+                            relation.target_table, [(relation.target_column, 'IN', keys[start: start + 1000])])))
+
+            with Py2SQL.__instrumentation.building():
+                related = dict()
+                related_objects = Py2SQL.__mapped_objects(relation.target_table, target_class, data, id_index)
+                for item, related_object in zip(data, related_objects):
+                    if relation.many:
+                        related.setdefault(item[target_index], []).append(related_object)
+                    else:
+                        related.setdefault(item[target_index], related_object)
+
+                for py_object in objects:
+                    key = getattr(py_object, relation.column)
+                    relation.set(py_object, list(related.get(key, ())) if relation.many else related.get(key))
 
-        column_names = [column[0] for column in cursor]
-        table_camel = Py2SQL.__to_camel_case(table)
-        Py2SQL.__create_class(table_camel, column_names, module)
+    @staticmethod
+    def __mapped_objects(table, table_class, items, id_index):
+        # Objects are created by compiled factory of class if they aren't mapped by id
+        if Py2SQL.__identity_map is None or id_index is None:
+            return table_class._from_rows(items)
+        return [Py2SQL.__mapped_object(table, table_class, item, id_index) for item in items]
 
-        reload(__import__(module))
-        exec(f'from {module} import {table_camel}', globals())
+    @staticmethod
+    def __mapped_object(table, table_class, item, id_index):
+        py_object = table_class._from_row(item)
+        identity_map = Py2SQL.__identity_map
+        if identity_map is None:
+            return py_object
+
+        key = (Py2SQL.__database_name, table, item[id_index])
+        mapped_object = identity_map.setdefault(key, py_object)
+        if mapped_object is py_object:
+            return py_object
+        if type(mapped_object) is table_class:
+            # Object which is already mapped is updated with fetched values
+            table_class.__init__(mapped_object, *item)
+            Relation.clear(mapped_object)
+            return mapped_object
+        identity_map.put(key, py_object)
+        return py_object
 
     @staticmethod
     def __to_camel_case(s):
@@ -418,118 +1609,285 @@ class Py2SQL(metaclass=InitLocker):
         return new_s
 
     @staticmethod
-    def __create_class(table, column_names, module):
-        file = open(module + '.py', 'a+')
-
-        all_classes = pyclbr.readmodule(module)
-        if table in all_classes:
-            return
-
-        if os.stat(module + '.py').st_size > 0:
-            file.write('\n\n')
+    def __object_fields(py_object):
+        column_names = getattr(type(py_object), ClassRegistry.COLUMNS_ATTRIBUTE, None)
+        if column_names is not None:
+            return {name: getattr(py_object, name) for name in column_names if hasattr(py_object, name)}
+        return py_object.__dict__
 
-        file.write(f'class {table}:\n')
-        file.write('\tdef __init__(self')
-        for col in column_names:
-            file.write(', ' + col)
-        file.write('):\n')
-        if len(column_names) == 0:
-            file.write('\t\tpass\n')
-        else:
-            for col in column_names:
-                file.write('\t\tself.' + col + ' = ' + col + '\n')
-        file.close()
+    @staticmethod
+    def __export_class(table_class, path):
+        source = ''
+        if os.path.exists(path):
+            with open(path) as file:
+                source = file.read()
+            class_names = [node.name for node in ast.parse(source).body if isinstance(node, ast.ClassDef)]
+            if table_class.__name__ in class_names:
+                return
+
+        with open(path, 'a') as file:
+            if len(source) > 0:
+                file.write('\n\n')
+            file.write(ClassRegistry.source(table_class.__name__,
+                                            getattr(table_class, ClassRegistry.COLUMNS_ATTRIBUTE)))
 
     @staticmethod
-    def create_hierarchy(table: str, package: str) -> None:
+    @instrumented
+    def create_hierarchy(table: str, package: str or None = None, workers: int = 1) -> Dict[str, type]:
         """
         Creates new classes using current table and other tables that are transitively connected with current table and
-        add classes to package
+        registers them in memory
+        If package is given, sources of classes are also written to package, one module per class
 
         :param table: table name
-        :param package: package name where to add new modules with classes
+        :param package: package name where to add new modules with classes or None to keep classes only in memory
+        :param workers: count of threads that create and export classes of different tables concurrently
+        :return: dictionary where key is table name and value is created class,
+        tables referenced by table go before tables that reference it unless they reference each other in a cycle
         """
         Py2SQL.__check_connection()
+        Py2SQL.__check_workers(workers)
 
-        def write_to_init(t_snake, t_camel):
-            with open(os.path.join(package, '__init__.py'), 'a+') as init_file:
-                init_file.write(f'from .{t_snake} import {t_camel}\n')
+        hierarchy = Py2SQL.__hierarchy_tables(table)
+        Py2SQL.__preload_structures(hierarchy)
 
-            try:
-                reload(__import__(package + '.__init__'))
-            except ModuleNotFoundError:
+        if package is not None:
+            if os.path.exists(package):
                 shutil.rmtree(package)
-                print('Error occurred 1 time in 100 due to reload import func, please retry again')
-                raise
+            os.mkdir(package)
 
-        name = Py2SQL.db_name()
+        def create(current_table):
+            table_class = Py2SQL.__table_class(current_table)
+            if package is not None:
+                table_snake = Py2SQL.__to_snake_case(current_table)
+                Py2SQL.__export_class(table_class, os.path.join(package, table_snake + '.py'))
+            return table_class
 
-        used_table = []
-        table_names = [table]
+        result = dict(zip(hierarchy, Py2SQL.__map_tables(create, hierarchy, workers)))
 
-        if os.path.exists(package):
-            shutil.rmtree(package)
-        os.mkdir(package)
+        if package is not None:
+            with open(os.path.join(package, '__init__.py'), 'a') as init_file:
+                for current_table, table_class in result.items():
+                    init_file.write(f'from .{Py2SQL.__to_snake_case(current_table)} import {table_class.__name__}\n')
 
-        ok = True
-        while ok:
-            current_table = table_names[0]
-            used_table.append(current_table)
+        return result
 
-            table_camel = Py2SQL.__to_camel_case(current_table)
-            table_snake = Py2SQL.__to_snake_case(current_table)
+    @staticmethod
+    @instrumented
+    def load_hierarchy(table: str, workers: int = 1) -> Dict[str, List[Any]]:
+        """
+        Creates classes of hierarchy like create_hierarchy and creates objects from all rows of its tables,
+        rows of different tables are read concurrently by workers threads, every thread borrows connection from pool
 
-            cursor = Py2SQL.__database_connection.cursor()
-            cursor.execute("SHOW COLUMNS FROM " + current_table + ";")
-            column_names = [column[0] for column in cursor]
-            Py2SQL.__create_class(table_camel, column_names, table_snake)
+        :param table: table name
+        :param workers: count of threads that read tables concurrently, should not exceed pool_size of db_connect
+        :return: dictionary where key is table name and value is list of created objects
+        """
+        Py2SQL.__check_connection()
+        Py2SQL.__check_workers(workers)
 
-            os.replace(table_snake + ".py", os.path.join(package, table_snake + ".py"))
+        classes = Py2SQL.create_hierarchy(table, workers=workers)
 
-            write_to_init(table_snake, table_camel)
+        def load(current_table):
+            data = Py2SQL.__snapshot_rows(current_table)
+            if data is None:
+                data = Py2SQL.__fetch_all(*QueryBuilder.select(current_table))
 
-            exec(f'from {package} import {table_camel}', globals())
+            table_class = classes[current_table]
+            column_names = getattr(table_class, ClassRegistry.COLUMNS_ATTRIBUTE)
+            id_index = column_names.index('id') if 'id' in column_names else None
+            with Py2SQL.__instrumentation.building():
+                return Py2SQL.__mapped_objects(current_table, table_class, data, id_index)
 
-            table_names.extend(Py2SQL.__get_reference_to(name, current_table))
-            table_names.extend(Py2SQL.__get_reference_from(name, current_table))
+        return dict(zip(classes, Py2SQL.__map_tables(load, list(classes), workers)))
 
-            while len(table_names) > 0 and table_names[0] in used_table:
-                if len(table_names) > 1:
-                    table_names = table_names[1:]
+    @staticmethod
+    @instrumented
+    def prefetch(objects: List[Any], *relations: str) -> None:
+        """
+        Loads relations of objects created by Py2SQL with one query WHERE column IN (...) per relation,
+        instead of one query per object on first access of relation attribute
+        Relations are attributes of generated classes built from foreign keys: referenced object is named
+        by singular referenced table (order.customer) and list of referencing objects by referencing table
+        (customer.orders), names of self-references and names that clash with columns are qualified by column
+        (employee.reportsTo_employee and employee.employees_by_reportsTo)
+
+        :param objects: objects of generated classes
+        :param relations: names of relations, nested relations are separated by dot, for example 'orders.customer'
+        """
+
+        Py2SQL.__check_connection()
+
+        objects = list(objects)
+        for path in relations:
+            if type(path) != str or len(path) == 0:
+                raise TypeError('relations must be non-empty str')
+            Py2SQL.__prefetch_path(objects, path.split('.'))
+
+    @staticmethod
+    def __prefetch_path(objects, names):
+        objects_by_class = dict()
+        for py_object in objects:
+            objects_by_class.setdefault(type(py_object), []).append(py_object)
+
+        related_objects = dict()
+        for object_class, class_objects in objects_by_class.items():
+            relation = getattr(object_class, Relation.RELATIONS_ATTRIBUTE, dict()).get(names[0])
+            if relation is None:
+                raise ValueError(f'{object_class.__name__} has no relation {names[0]}')
+
+            missing_objects = [py_object for py_object in class_objects if not relation.is_loaded(py_object)]
+            if len(missing_objects) > 0:
+                Py2SQL.__load_relation(relation, missing_objects)
+
+            if len(names) > 1:
+                for py_object in class_objects:
+                    value = relation.__get__(py_object, object_class)
+                    for related_object in (value if relation.many else [value]):
+                        if related_object is not None:
+                            related_objects[id(related_object)] = related_object
+
+        if len(related_objects) > 0:
+            Py2SQL.__prefetch_path(list(related_objects.values()), names[1:])
+
+    @staticmethod
+    def __hierarchy_tables(table):
+        references = Py2SQL.__reference_graph()
+
+        hierarchy = [table]
+        used_tables = {table}
+        table_names = deque(hierarchy)
+        while len(table_names) > 0:
+            for reference in references.get(table_names.popleft(), ()):
+                if reference not in used_tables:
+                    used_tables.add(reference)
+                    hierarchy.append(reference)
+                    table_names.append(reference)
+
+        # Tables are sorted by depth-first search over references, so referenced tables go before referencing ones,
+        # references that close cycles are skipped
+        referenced_tables = dict()
+        for foreign_key in Py2SQL.__foreign_keys():
+            if foreign_key.table in used_tables:
+                referenced_tables.setdefault(foreign_key.table, []).append(foreign_key.referenced_table)
+
+        sorted_tables = list()
+        visited_tables = set()
+        for root in hierarchy:
+            if root in visited_tables:
+                continue
+            visited_tables.add(root)
+            stack = [(root, iter(referenced_tables.get(root, ())))]
+            while len(stack) > 0:
+                current_table, targets = stack[-1]
+                target = next((x for x in targets if x not in visited_tables), None)
+                if target is None:
+                    stack.pop()
+                    sorted_tables.append(current_table)
                 else:
-                    table_names = []
+                    visited_tables.add(target)
+                    stack.append((target, iter(referenced_tables.get(target, ()))))
+        return sorted_tables
 
-            if len(table_names) == 0:
-                ok = False
+    @staticmethod
+    def __check_workers(workers):
+        if type(workers) != int or workers < 1:
+            raise ValueError('workers must be positive int')
 
     @staticmethod
-    def __get_reference_to(db_name, table):
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute("SELECT referenced_table_name "
-                       "FROM information_schema.KEY_COLUMN_USAGE "
-                       "WHERE table_schema = '" + db_name +
-                       "' and table_name = '" + table +
-                       "' and NOT referenced_table_name IS NULL;")
+    def __map_tables(function, tables, workers):
+        # Results are returned in order of tables, worker threads attribute their queries to method of caller
+        if workers == 1 or len(tables) < 2:
+            return [function(table) for table in tables]
+
+        method = Py2SQL.__instrumentation.current_method()
 
-        return [column[0] for column in cursor]
+        def run(table):
+            if method is None:
+                return function(table)
+            with Py2SQL.__instrumentation.context(method):
+                return function(table)
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(tables))) as executor:
+            return list(executor.map(run, tables))
+
+    @staticmethod
+    def __foreign_keys():
+        key = ('foreign_keys', Py2SQL.__database_name)
+        foreign_keys = Py2SQL.__schema_get(key)
+        if foreign_keys is None:
+            data = Py2SQL.__fetch_all('SELECT CONSTRAINT_NAME, TABLE_NAME, COLUMN_NAME, '
+                                      'REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME '
+                                      'FROM information_schema.KEY_COLUMN_USAGE '
+                                      'WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL '
+                                      'ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION;')
+            foreign_keys = tuple(ForeignKey(*item) for item in data)
+            Py2SQL.__schema_cache.put(key, foreign_keys)
+        return foreign_keys
 
     @staticmethod
-    def __get_reference_from(db_name, table):
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute("SELECT table_name "
-                       "FROM information_schema.KEY_COLUMN_USAGE "
-                       "WHERE table_schema = '" + db_name + "' and referenced_table_name = '" + table + "' ;")
+    def __reference_graph():
+        # Tables referenced by table go before tables that reference it, as they were found by separate queries before
+        references_to = dict()
+        references_from = dict()
+        for foreign_key in Py2SQL.__foreign_keys():
+            references_to.setdefault(foreign_key.table, []).append(foreign_key.referenced_table)
+            references_from.setdefault(foreign_key.referenced_table, []).append(foreign_key.table)
 
-        return [column[0] for column in cursor]
+        return {table: references_to.get(table, []) + references_from.get(table, [])
+                for table in set(references_to) | set(references_from)}
+
+    @staticmethod
+    def __preload_structures(tables):
+        database = Py2SQL.__database_name
+        if any(Py2SQL.__schema_get(('structure', database, table)) is None for table in tables):
+            Py2SQL.load_schema()
 
     @staticmethod
     def __check_connection():
-        if Py2SQL.__database_connection is None:
+        if Py2SQL.__connection_pool is None:
             raise ValueError('Database isn\'t connected')
 
     @staticmethod
-    def __select_single_query(query):
-        cursor = Py2SQL.__database_connection.cursor()
-        cursor.execute(query)
-        data = cursor.fetchone()
-        return data[0]
+    def __connection():
+        Py2SQL.__check_connection()
+        return Py2SQL.__connection_pool.connection()
+
+    @staticmethod
+    def __schema_get(key):
+        value = Py2SQL.__schema_cache.get(key)
+        Py2SQL.__instrumentation.record_cache(value is not None)
+        return value
+
+    @staticmethod
+    def __fetch_all(query, parameters=None, prepared=False):
+        with Py2SQL.__connection() as connection:
+            if prepared and Py2SQL.__statement_cache_size > 0:
+                cursor, query = Py2SQL.__prepared_statement(connection, query)
+            else:
+                cursor = connection.cursor()
+            start = Py2SQL.__instrumentation.before_query(query, parameters)
+            cursor.execute(query, parameters)
+            data = cursor.fetchall()
+            Py2SQL.__instrumentation.after_query(query, parameters, start, len(data))
+            return data
+
+    @staticmethod
+    def __prepared_statement(connection, query):
+        # Prepared cursor reuses its statement only if it gets the same str object, so it is cached with the cursor
+        with Py2SQL.__statement_caches_lock:
+            statements = Py2SQL.__statement_caches.get(connection)
+            if statements is None:
+                statements = TTLCache(max_size=Py2SQL.__statement_cache_size,
+                                      on_evict=lambda key, statement: statement[0].close())
+                Py2SQL.__statement_caches[connection] = statements
+
+        statement = statements.get(query)
+        if statement is None:
+            statement = (connection.cursor(prepared=True), query)
+            statements.put(query, statement)
+        return statement
+
+    @staticmethod
+    def __select_single_query(query, parameters=None):
+        return Py2SQL.__fetch_all(query, parameters)[0][0]
@@ -0,0 +1,127 @@
+"""
+Has the implementation of RefreshableResultSet class
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .result_set import ResultSet
+
+
+class RefreshableResultSet(ResultSet):
+    """
+    ResultSet that remembers version of its table and the last seen values of key and timestamp columns,
+    so it can be brought up to date by Py2SQL.refresh without reading the whole table again
+    Rows are merged by key: fetched row replaces stored row with the same key or is appended
+    """
+
+    def __init__(self, table: str, columns: List[Tuple[str, str]], rows: List[Tuple[Any, ...]],
+                 attributes: Sequence[Tuple[str, Any]], key_columns: Sequence[str],
+                 timestamp_column: str or None, checksum: bool, version: List[Any],
+                 refresher: Callable[['RefreshableResultSet', bool], int], append_only: bool = False) -> None:
+        """
+        Init function
+
+        :param table: table name which rows are stored
+        :param columns: list of tuples (attribute, type)
+        :param rows: list of tuples of attribute values in order of columns
+        :param attributes: pairs (name, value) which rows were filtered by
+        :param key_columns: names of primary key columns, rows aren't merged by key if empty
+        :param timestamp_column: name of column with time of last change of row or None
+        :param checksum: compare CHECKSUM TABLE in addition to UPDATE_TIME to detect changes
+        :param version: version of table read before rows, see Py2SQL.snapshot
+        :param refresher: function that takes result and flag of full refresh and refreshes result
+        :param append_only: rows of table are only inserted, so rows with key greater than the last seen one
+        are enough to refresh result without timestamp column
+        """
+
+        super().__init__(table, columns, list(rows))
+        self.attributes = tuple(attributes)
+        self.key_columns = tuple(key_columns)
+        self.timestamp_column = timestamp_column
+        self.checksum = checksum
+        self.version = version
+        self.refresher = refresher
+        self.append_only = append_only
+
+        names = self.names
+        self.__key_indexes = tuple(names.index(column) for column in self.key_columns)
+        self.__timestamp_index = names.index(timestamp_column) if timestamp_column is not None else None
+        self.__positions: Dict[Any, int] or None = None
+        self.last_key = None
+        self.last_timestamp = None
+        self.__update_last_values(self.rows)
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Refreshes rows, same as Py2SQL.refresh(self, full)
+
+        :param full: read all rows again even if table is unchanged
+        :return: count of fetched rows
+        """
+
+        return self.refresher(self, full)
+
+    def merge(self, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """
+        Replaces stored rows with the same key as fetched rows and appends other fetched rows
+
+        :param rows: fetched rows in order of columns
+        :return: count of appended rows
+        """
+
+        if len(self.__key_indexes) == 0:
+            self.rows.extend(rows)
+            self.__update_last_values(rows)
+            return len(rows)
+
+        positions = self.__positions
+        if positions is None:
+            positions = {self.__key(row): i for i, row in enumerate(self.rows)}
+            self.__positions = positions
+
+        appended = 0
+        for row in rows:
+            key = self.__key(row)
+            position = positions.get(key)
+            if position is None:
+                positions[key] = len(self.rows)
+                self.rows.append(row)
+                appended += 1
+            else:
+                self.rows[position] = row
+
+        self.__update_last_values(rows)
+        return appended
+
+    def replace(self, rows: Sequence[Tuple[Any, ...]]) -> None:
+        """
+        Replaces all stored rows, rows that were deleted from table are removed only this way
+
+        :param rows: fetched rows in order of columns
+        """
+
+        self.rows[:] = rows
+        self.__positions = None
+        self.last_key = None
+        self.last_timestamp = None
+        self.__update_last_values(self.rows)
+
+    def __repr__(self) -> str:
+        return (f'RefreshableResultSet(table={self.table!r}, columns={len(self.columns)}, rows={len(self.rows)}, '
+                f'version={self.version!r})')
+
+    def __key(self, row):
+        return tuple(row[i] for i in self.__key_indexes)
+
+    def __update_last_values(self, rows):
+        if len(self.__key_indexes) == 1:
+            last_key = max((row[self.__key_indexes[0]] for row in rows
+                            if row[self.__key_indexes[0]] is not None), default=None)
+            if last_key is not None and (self.last_key is None or last_key > self.last_key):
+                self.last_key = last_key
+
+        if self.__timestamp_index is not None:
+            last_timestamp = max((row[self.__timestamp_index] for row in rows
+                                  if row[self.__timestamp_index] is not None), default=None)
+            if last_timestamp is not None and (self.last_timestamp is None or last_timestamp > self.last_timestamp):
+                self.last_timestamp = last_timestamp
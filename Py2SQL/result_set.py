@@ -0,0 +1,121 @@
+"""
+Has the implementation of ResultSet class
+"""
+
+from collections import namedtuple
+from typing import Any, Dict, Iterator, List, Tuple
+
+import threading
+
+
+class ResultSet:
+    """
+    Compact representation of table rows: one shared header of column names and types
+    and rows stored as plain tuples of values
+    """
+
+    __record_classes: Dict[Tuple[str, Tuple[str, ...]], type] = dict()
+    __record_classes_lock = threading.Lock()
+
+    def __init__(self, table: str, columns: List[Tuple[str, str]], rows: List[Tuple[Any, ...]]) -> None:
+        """
+        Init function
+
+        :param table: table name which rows are stored
+        :param columns: list of tuples (attribute, type),
+        where attribute - name of attribute, type - type of attribute
+        :param rows: list of tuples of attribute values in order of columns
+        """
+
+        self.table = table
+        self.columns = tuple((name, column_type) for name, column_type in columns)
+        self.rows = rows
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """
+        Returns names of columns
+
+        :return: tuple of column names
+        """
+
+        return tuple(column[0] for column in self.columns)
+
+    @property
+    def types(self) -> Tuple[str, ...]:
+        """
+        Returns types of columns
+
+        :return: tuple of column types
+        """
+
+        return tuple(column[1] for column in self.columns)
+
+    @property
+    def record_class(self) -> type:
+        """
+        Returns named tuple class for rows of the table, class is generated once per table and columns
+        Column names that aren't valid identifiers are replaced by positional names (_0, _1, ...)
+
+        :return: named tuple class
+        """
+
+        names = self.names
+        key = (self.table, names)
+        record_class = ResultSet.__record_classes.get(key)
+        if record_class is None:
+            with ResultSet.__record_classes_lock:
+                record_class = ResultSet.__record_classes.get(key)
+                if record_class is None:
+                    record_class = namedtuple(ResultSet.__record_name(self.table), names, rename=True)
+                    ResultSet.__record_classes[key] = record_class
+        return record_class
+
+    def records(self) -> Iterator[Any]:
+        """
+        Yields rows as named tuples with attribute access by column name
+
+        :return: generator of named tuples
+        """
+
+        make = self.record_class._make
+        for row in self.rows:
+            yield make(row)
+
+    def legacy_row(self, index: int) -> List[Tuple[str, str, Any]]:
+        """
+        Returns row in format of find_objects_by
+
+        :param index: index of row
+        :return: list of tuples (attribute, type, value)
+        """
+
+        return [(column[0], column[1], value) for column, value in zip(self.columns, self.rows[index])]
+
+    def to_legacy(self) -> List[List[Tuple[str, str, Any]]]:
+        """
+        Returns all rows in format of find_objects_by
+
+        :return: list of table rows, table row is list of tuples: (attribute, type, value)
+        """
+
+        return [self.legacy_row(i) for i in range(len(self.rows))]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return iter(self.rows)
+
+    def __getitem__(self, index: int) -> Tuple[Any, ...]:
+        return self.rows[index]
+
+    def __repr__(self) -> str:
+        return f'ResultSet(table={self.table!r}, columns={len(self.columns)}, rows={len(self.rows)})'
+
+    @staticmethod
+    def __record_name(table):
+        name = ''.join(c if c.isalnum() else '_' for c in table)
+        if len(name) == 0 or not name.isidentifier():
+            name = 'Record'
+        return name
@@ -0,0 +1,204 @@
+"""
+Benchmarks Py2SQL lookups on the classicmodels sample database (DB/mysqlsampledatabase.sql)
+and writes latency percentiles, throughput and peak memory of every operation as JSON,
+so results of different versions can be compared
+
+Sample database can be loaded with --load and scaled up with synthetic customers and orders with --customers,
+synthetic rows have ids starting from 1000000 and are replaced on every run with --customers
+
+Usage: python benchmarks/classicmodels.py --host localhost --user root --password '' --load --customers 100000
+           --output results.json
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import mysql.connector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from Py2SQL import DatabaseInfo, Py2SQL
+
+SAMPLE_DATABASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'DB', 'mysqlsampledatabase.sql')
+SYNTHETIC_FIRST_ID = 1000000
+STATUSES = ('Shipped', 'Resolved', 'Cancelled', 'On Hold', 'Disputed', 'In Process')
+
+
+def connect(db, database=True):
+    return mysql.connector.connect(host=db.host, user=db.user, password=db.password,
+                                   database=db.database if database else None)
+
+
+def sql_statements(path):
+    # Every statement of the dump ends with semicolon at the end of line, values may contain semicolons
+    statement = []
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            statement.append(line)
+            if line.rstrip().endswith(';'):
+                text = ''.join(statement).strip()
+                statement = []
+                if text != ';':
+                    yield text
+
+
+def load_sample_database(db):
+    connection = connect(db, database=False)
+    cursor = connection.cursor()
+    for statement in sql_statements(SAMPLE_DATABASE):
+        cursor.execute(statement)
+        if cursor.with_rows:
+            cursor.fetchall()
+    connection.commit()
+    connection.close()
+
+
+def add_synthetic_rows(db, customers, orders_per_customer, seed):
+    connection = connect(db)
+    cursor = connection.cursor()
+    cursor.execute('DELETE FROM orders WHERE id >= %s;', (SYNTHETIC_FIRST_ID,))
+    cursor.execute('DELETE FROM customers WHERE id >= %s;', (SYNTHETIC_FIRST_ID,))
+    cursor.execute('SELECT id FROM employees WHERE jobTitle = %s;', ('Sales Rep',))
+    sales_reps = [x[0] for x in cursor.fetchall()]
+
+    generator = random.Random(seed)
+    batch = []
+    for i in range(customers):
+        batch.append((SYNTHETIC_FIRST_ID + i, f'Customer {i}', f'Last {generator.randrange(1000)}',
+                      f'First {generator.randrange(1000)}', f'{generator.randrange(10 ** 10):010}',
+                      f'{generator.randrange(1000)} Main St.', None, f'City {generator.randrange(500)}', None,
+                      f'{generator.randrange(10 ** 5):05}', f'Country {generator.randrange(30)}',
+                      generator.choice(sales_reps), generator.randrange(10 ** 7) / 100))
+        if len(batch) == 5000 or i == customers - 1:
+            cursor.executemany('INSERT INTO customers VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);',
+                               batch)
+            batch = []
+
+    order_id = SYNTHETIC_FIRST_ID
+    start_date = datetime.date(2003, 1, 1)
+    for i in range(customers):
+        for _ in range(orders_per_customer):
+            order_date = start_date + datetime.timedelta(days=generator.randrange(1000))
+            batch.append((order_id, order_date, order_date + datetime.timedelta(days=7), None,
+                          generator.choice(STATUSES), None, SYNTHETIC_FIRST_ID + i))
+            order_id += 1
+            if len(batch) == 5000:
+                cursor.executemany('INSERT INTO orders VALUES (%s, %s, %s, %s, %s, %s, %s);', batch)
+                batch = []
+    if len(batch) > 0:
+        cursor.executemany('INSERT INTO orders VALUES (%s, %s, %s, %s, %s, %s, %s);', batch)
+
+    connection.commit()
+    connection.close()
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of sorted values
+    index = max(0, min(len(values) - 1, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def measure(function, repeat, count=len):
+    function()
+
+    latencies = []
+    objects = 0
+    Py2SQL.reset_stats()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        latencies.append(time.perf_counter() - start)
+        objects += count(result)
+    stats = Py2SQL.stats()['methods']
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'repeat': repeat,
+        'objects_per_call': objects / repeat,
+        'latency_seconds': {
+            'min': latencies[0],
+            'mean': total / repeat,
+            'p50': percentile(latencies, 0.5),
+            'p90': percentile(latencies, 0.9),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1]
+        },
+        'calls_per_second': repeat / total,
+        'objects_per_second': objects / total,
+        'peak_memory_bytes': peak,
+        'round_trips_per_call': sum(x['round_trips'] for x in stats.values()) / repeat
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='classicmodels')
+    parser.add_argument('--load', action='store_true', help='(re)create database from DB/mysqlsampledatabase.sql')
+    parser.add_argument('--customers', type=int, default=0, help='count of synthetic customers to add')
+    parser.add_argument('--orders-per-customer', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50, help='count of measured calls of every operation')
+    parser.add_argument('--pool-size', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='path of JSON file, results are printed if omitted')
+    args = parser.parse_args()
+
+    db = DatabaseInfo(args.host, args.user, args.password, args.database)
+    if args.load:
+        load_sample_database(db)
+    if args.customers > 0:
+        add_synthetic_rows(db, args.customers, args.orders_per_customer, args.seed)
+
+    Py2SQL.db_connect(db, pool_size=args.pool_size)
+    customer = Py2SQL.create_object('customers', 103)
+    last_customer = SYNTHETIC_FIRST_ID + args.customers - 1
+
+    # find_object returns fields of one found object
+    operations = {
+        'find_object': (lambda: Py2SQL.find_object('customers', customer), lambda result: int(len(result) > 0)),
+        'find_objects_by': (lambda: Py2SQL.find_objects_by('orders', ('status', 'Shipped')), len),
+        'find_class': (lambda: Py2SQL.find_class(customer), len),
+        'find_classes_by': (lambda: Py2SQL.find_classes_by(('id',), ('status',)), len),
+        'create_objects': (lambda: Py2SQL.create_objects('customers', 1, last_customer), len),
+        'create_hierarchy': (lambda: Py2SQL.create_hierarchy('orderdetails'), len)
+    }
+
+    results = {
+        'python': platform.python_version(),
+        'engine': Py2SQL.db_engine(),
+        'database': args.database,
+        'table_sizes': {table: Py2SQL.db_table_size(table) for table in Py2SQL.db_tables()},
+        'synthetic_customers': args.customers,
+        'orders_per_customer': args.orders_per_customer,
+        'operations': {name: measure(function, args.repeat, count)
+                       for name, (function, count) in operations.items()}
+    }
+
+    Py2SQL.db_disconnect()
+
+    text = json.dumps(results, indent=2, default=str)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
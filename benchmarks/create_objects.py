@@ -0,0 +1,91 @@
+"""
+Compares single query Py2SQL.create_objects with keyset paginated Py2SQL.iter_objects
+on a seeded table of synthetic rows
+
+Usage: python benchmarks/create_objects.py --host localhost --user root --password '' --database db
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import mysql.connector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from Py2SQL import DatabaseInfo, Py2SQL
+
+TABLE = 'py2sql_bench_items'
+
+
+def seed_table(db, rows, seed):
+    connection = mysql.connector.connect(host=db.host, user=db.user, password=db.password, database=db.database)
+    cursor = connection.cursor()
+    cursor.execute(f'DROP TABLE IF EXISTS {TABLE};')
+    cursor.execute(f'CREATE TABLE {TABLE} ('
+                   'id INT PRIMARY KEY, '
+                   'name VARCHAR(64) NOT NULL, '
+                   'price DECIMAL(10, 2) NOT NULL, '
+                   'quantity INT NOT NULL, '
+                   'created DATETIME NOT NULL);')
+
+    generator = random.Random(seed)
+    batch = []
+    for i in range(1, rows + 1):
+        batch.append((i, f'item {generator.randrange(10 ** 6)}', generator.randrange(10 ** 6) / 100,
+                      generator.randrange(1000), f'2020-01-01 {generator.randrange(24):02}:00:00'))
+        if len(batch) == 5000 or i == rows:
+            cursor.executemany(f'INSERT INTO {TABLE} VALUES (%s, %s, %s, %s, %s);', batch)
+            batch = []
+    connection.commit()
+    connection.close()
+
+
+def measure(name, function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{name:<40} {count:>9} objects {elapsed:>8.3f} s {count / elapsed:>12.0f} obj/s '
+          f'{peak / 1024 / 1024:>9.1f} MiB peak')
+
+
+def consume(iterator):
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', required=True)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--page-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    db = DatabaseInfo(args.host, args.user, args.password, args.database)
+    seed_table(db, args.rows, args.seed)
+
+    Py2SQL.db_connect(db, pool_size=2)
+    Py2SQL.create_objects(TABLE, 1, 1)
+
+    rows, page_size = args.rows, args.page_size
+    measure('create_objects (single query)', lambda: len(Py2SQL.create_objects(TABLE, 1, rows)))
+    measure('iter_objects', lambda: consume(Py2SQL.iter_objects(TABLE, 1, rows, page_size)))
+    measure('iter_objects (prefetch)', lambda: consume(Py2SQL.iter_objects(TABLE, 1, rows, page_size, True)))
+
+    Py2SQL.db_disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Measures throughput of creating objects of generated classes from table rows:
+per-row __init__ call compared with compiled _from_rows factory on synthetic rows,
+and if --database is given, Py2SQL.create_objects on a seeded table split into database time and build time
+
+Usage: python benchmarks/materialization.py --rows 500000
+       python benchmarks/materialization.py --host localhost --user root --password '' --database db
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from Py2SQL import DatabaseInfo, Py2SQL
+from Py2SQL._class_registry import ClassRegistry
+
+from create_objects import TABLE, seed_table
+
+COLUMNS = ['id', 'name', 'price', 'quantity', 'created']
+
+
+def best_of(repeat, function):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(name, rows, seconds):
+    print(f'{name:<40} {rows:>9} objects {seconds:>8.3f} s {rows / seconds:>12.0f} obj/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rows = [(i, f'item {i}', i / 100, i % 1000, '2020-01-01 00:00:00') for i in range(args.rows)]
+    slotted_class = ClassRegistry.generate('Item', COLUMNS)
+    generic_class = ClassRegistry.generate('Item', COLUMNS[:-1] + ['created at'])
+
+    report('__init__ per row (slots)', args.rows, best_of(args.repeat, lambda: [slotted_class(*row) for row in rows]))
+    report('_from_rows (slots)', args.rows, best_of(args.repeat, lambda: slotted_class._from_rows(rows)))
+    report('_from_rows (no slots)', args.rows, best_of(args.repeat, lambda: generic_class._from_rows(rows)))
+
+    if args.database is None:
+        return
+
+    db = DatabaseInfo(args.host, args.user, args.password, args.database)
+    seed_table(db, args.rows, args.seed)
+
+    Py2SQL.db_connect(db)
+    Py2SQL.create_objects(TABLE, 1, 1)
+    Py2SQL.reset_stats()
+
+    seconds = best_of(args.repeat, lambda: Py2SQL.create_objects(TABLE, 1, args.rows))
+    report('create_objects', args.rows, seconds)
+
+    stats = Py2SQL.stats()['methods']['create_objects']
+    print(f'{"":<40} database {stats["server_seconds"] / stats["calls"]:.3f} s per call, '
+          f'build {stats["build_seconds"] / stats["calls"]:.3f} s per call')
+
+    Py2SQL.db_disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,7 @@ setup(
     description="",
     long_description="",
     install_requires=["mysql.connector"],
+    extras_require={"numpy": ["numpy"]},
     url="https://htmlpreview.github.io/?https://github.com/symphony-of-nirfolio-uni/Metaprogramming-lab3/blob/dev/documentation/Py2SQL.html",
     packages=find_packages(),
     python_requires='>=3.6',
@@ -0,0 +1,79 @@
+import unittest
+from unittest import mock
+
+from Py2SQL._cache import TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_get_put(self):
+        cache = TTLCache(max_size=2)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', 0), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_least_recently_used_is_evicted(self):
+        evicted = []
+        cache = TTLCache(max_size=2, on_evict=lambda key, value: evicted.append((key, value)))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(evicted, [('b', 2)])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_replaced_value_is_evicted(self):
+        evicted = []
+        cache = TTLCache(on_evict=lambda key, value: evicted.append((key, value)))
+        value = object()
+        cache.put('a', value)
+        cache.put('a', value)
+        self.assertEqual(evicted, [])
+        cache.put('a', 2)
+        self.assertEqual(evicted, [('a', value)])
+
+    def test_expired_entry(self):
+        evicted = []
+        cache = TTLCache(ttl=10, on_evict=lambda key, value: evicted.append(key))
+        with mock.patch('time.monotonic', return_value=100.0):
+            cache.put('a', 1)
+        with mock.patch('time.monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(evicted, ['a'])
+
+    def test_setdefault(self):
+        cache = TTLCache(ttl=10)
+        with mock.patch('time.monotonic', return_value=100.0):
+            self.assertEqual(cache.setdefault('a', 1), 1)
+            self.assertEqual(cache.setdefault('a', 2), 1)
+        with mock.patch('time.monotonic', return_value=110.0):
+            self.assertEqual(cache.setdefault('a', 3), 3)
+
+    def test_invalidate_and_remove(self):
+        evicted = []
+        cache = TTLCache(on_evict=lambda key, value: evicted.append(key))
+        for key in [('t', 1), ('t', 2), ('u', 1)]:
+            cache.put(key, key)
+        self.assertEqual(cache.invalidate(lambda key: key[0] == 't'), 2)
+        self.assertEqual(cache.remove([('u', 1), ('v', 1)]), 1)
+        self.assertEqual(cache.invalidate(), 0)
+        self.assertEqual(sorted(evicted), [('t', 1), ('t', 2), ('u', 1)])
+
+    def test_info(self):
+        cache = TTLCache(max_size=3, ttl=5.0)
+        cache.put('a', 1)
+        self.assertEqual(cache.info(), {'hits': 0, 'misses': 0, 'size': 1, 'max_size': 3, 'ttl': 5.0})
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TTLCache(max_size=0)
+        with self.assertRaises(ValueError):
+            TTLCache(ttl=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
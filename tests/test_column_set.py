@@ -0,0 +1,59 @@
+import unittest
+
+from Py2SQL.column_set import ColumnSet
+
+COLUMNS = [('id', 'int(11)'), ('total', 'decimal(10,2)'), ('status', 'varchar(15)')]
+
+
+class ColumnSetTest(unittest.TestCase):
+    def test_typecode(self):
+        self.assertEqual(ColumnSet.typecode('int(11)'), 'q')
+        self.assertEqual(ColumnSet.typecode('BIGINT(20) UNSIGNED'), 'Q')
+        self.assertEqual(ColumnSet.typecode('bigint'), 'q')
+        self.assertEqual(ColumnSet.typecode(b'decimal(10,2)'), 'd')
+        self.assertEqual(ColumnSet.typecode('double'), 'd')
+        self.assertIsNone(ColumnSet.typecode('varchar(15)'))
+        self.assertIsNone(ColumnSet.typecode(''))
+
+    def test_from_batches_without_numpy(self):
+        batches = [[(1, 1.5, 'a'), (2, None, 'b')], [(3, 2.5, None)]]
+        columns = ColumnSet.from_batches('orders', COLUMNS, batches, use_numpy=False)
+
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.names, ('id', 'total', 'status'))
+        self.assertEqual(columns['id'].typecode, 'q')
+        self.assertEqual(list(columns['id']), [1, 2, 3])
+        self.assertEqual(list(columns['total']), [1.5, 0.0, 2.5])
+        self.assertEqual(columns['status'], ['a', 'b', None])
+        self.assertIsNone(columns.mask('id'))
+        self.assertEqual(list(columns.mask('total')), [0, 1, 0])
+        self.assertEqual(list(columns.mask('status')), [0, 0, 1])
+        self.assertIn('status', columns)
+        with self.assertRaises(KeyError):
+            columns.mask('missing')
+
+    def test_mask_is_created_in_later_batch(self):
+        batches = [[(1, 1.0, 'a')], [(2, 2.0, 'b'), (3, None, 'c')], [(4, 4.0, 'd')]]
+        columns = ColumnSet.from_batches('orders', COLUMNS, batches, use_numpy=False)
+        self.assertEqual(list(columns.mask('total')), [0, 0, 1, 0])
+
+    def test_empty(self):
+        columns = ColumnSet.from_batches('orders', COLUMNS, [], use_numpy=False)
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(list(columns['id']), [])
+
+    def test_from_batches_with_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy isn\'t installed')
+
+        columns = ColumnSet.from_batches('orders', COLUMNS, [[(1, 1.5, 'a'), (2, None, 'b')]], use_numpy=True)
+        self.assertEqual(columns['id'].dtype, numpy.int64)
+        self.assertEqual(columns['total'].tolist(), [1.5, 0.0])
+        self.assertEqual(columns.mask('total').tolist(), [False, True])
+        self.assertEqual(columns['status'].dtype, object)
+
+
+if __name__ == '__main__':
+    unittest.main()
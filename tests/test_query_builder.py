@@ -0,0 +1,55 @@
+import unittest
+
+from Py2SQL._query_builder import QueryBuilder
+
+
+class QueryBuilderTest(unittest.TestCase):
+    def test_quote(self):
+        self.assertEqual(QueryBuilder.quote('orders'), '`orders`')
+        self.assertEqual(QueryBuilder.quote('a`b'), '`a``b`')
+        self.assertEqual(QueryBuilder.quote('x`; DROP TABLE y; --'), '`x``; DROP TABLE y; --`')
+        with self.assertRaises(TypeError):
+            QueryBuilder.quote(1)
+
+    def test_select_all(self):
+        self.assertEqual(QueryBuilder.select('orders'), ('SELECT * FROM `orders`;', ()))
+
+    def test_select_conditions_are_parameters(self):
+        statement, parameters = QueryBuilder.select('orders', [('id', '>=', 1), ('status', '=', "x' OR '1'='1")])
+        self.assertEqual(statement, 'SELECT * FROM `orders` WHERE `id` >= %s AND `status` = %s;')
+        self.assertEqual(parameters, (1, "x' OR '1'='1"))
+
+    def test_select_in_order_limit_columns(self):
+        statement, parameters = QueryBuilder.select('orders', [('id', 'IN', [1, 2, 3])], order_by='id', limit=10,
+                                                    columns=['id', 'status'])
+        self.assertEqual(statement,
+                         'SELECT `id`, `status` FROM `orders` WHERE `id` IN (%s, %s, %s) ORDER BY `id` LIMIT %s;')
+        self.assertEqual(parameters, (1, 2, 3, 10))
+
+    def test_where_rejects_unsupported_operator(self):
+        with self.assertRaises(ValueError):
+            QueryBuilder.where([('id', '= 1 OR 1 =', 1)])
+
+    def test_where_rejects_empty_in(self):
+        with self.assertRaises(ValueError):
+            QueryBuilder.where([('id', 'IN', [])])
+
+    def test_where_without_conditions(self):
+        self.assertEqual(QueryBuilder.where([]), ('', []))
+
+    def test_insert(self):
+        self.assertEqual(QueryBuilder.insert('orders', ['id', 'status']),
+                         'INSERT INTO `orders` (`id`, `status`) VALUES (%s, %s);')
+
+    def test_insert_upsert(self):
+        self.assertEqual(QueryBuilder.insert('orders', ['id', 'status'], ['status']),
+                         'INSERT INTO `orders` (`id`, `status`) VALUES (%s, %s) '
+                         'ON DUPLICATE KEY UPDATE `status` = VALUES(`status`);')
+
+    def test_insert_requires_columns(self):
+        with self.assertRaises(ValueError):
+            QueryBuilder.insert('orders', [])
+
+
+if __name__ == '__main__':
+    unittest.main()
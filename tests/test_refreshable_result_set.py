@@ -0,0 +1,58 @@
+import unittest
+
+from Py2SQL.refreshable_result_set import RefreshableResultSet
+
+COLUMNS = [('id', 'int'), ('status', 'varchar(15)'), ('updated', 'datetime')]
+
+
+def result_set(rows, key_columns=('id',), timestamp_column=None):
+    return RefreshableResultSet('orders', COLUMNS, rows, (), key_columns, timestamp_column, False, [None, 1],
+                                lambda result, full: 0)
+
+
+class RefreshableResultSetTest(unittest.TestCase):
+    def test_last_values(self):
+        result = result_set([(2, 'a', 5), (1, 'b', None), (3, 'c', 4)], timestamp_column='updated')
+        self.assertEqual(result.last_key, 3)
+        self.assertEqual(result.last_timestamp, 5)
+
+    def test_merge_replaces_rows_with_same_key_and_appends_others(self):
+        result = result_set([(1, 'a', 0), (2, 'b', 0)])
+        self.assertEqual(result.merge([(2, 'changed', 1), (3, 'c', 1)]), 1)
+        self.assertEqual(result.rows, [(1, 'a', 0), (2, 'changed', 1), (3, 'c', 1)])
+        self.assertEqual(result.last_key, 3)
+        self.assertEqual(result.merge([(3, 'again', 2)]), 0)
+        self.assertEqual(result.rows[2], (3, 'again', 2))
+
+    def test_merge_by_composite_key(self):
+        result = result_set([(1, 'a', 0), (1, 'b', 0)], key_columns=('id', 'status'))
+        self.assertEqual(result.merge([(1, 'b', 1), (2, 'a', 1)]), 1)
+        self.assertEqual(result.rows, [(1, 'a', 0), (1, 'b', 1), (2, 'a', 1)])
+        self.assertIsNone(result.last_key)
+
+    def test_merge_without_key_appends(self):
+        result = result_set([(1, 'a', 0)], key_columns=())
+        self.assertEqual(result.merge([(1, 'a', 0)]), 1)
+        self.assertEqual(len(result), 2)
+
+    def test_replace(self):
+        result = result_set([(1, 'a', 0), (5, 'b', 0)])
+        rows = result.rows
+        result.merge([(6, 'c', 0)])
+        result.replace([(2, 'x', 0)])
+        self.assertIs(result.rows, rows)
+        self.assertEqual(result.rows, [(2, 'x', 0)])
+        self.assertEqual(result.last_key, 2)
+        self.assertEqual(result.merge([(2, 'y', 0)]), 0)
+        self.assertEqual(result.rows, [(2, 'y', 0)])
+
+    def test_refresh_calls_refresher(self):
+        calls = []
+        result = RefreshableResultSet('orders', COLUMNS, [], (), ('id',), None, False, [None, 1],
+                                      lambda result, full: calls.append((result, full)) or 7)
+        self.assertEqual(result.refresh(full=True), 7)
+        self.assertEqual(calls, [(result, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()